@@ -1,5 +1,14 @@
+import argparse
 import time
 
+from fibonacci import fib, fib_digits, fib_series
+
+# Recursive version is exponential, only run it for small series
+RECURSIVE_LIMIT = 30
+
+# Terms with more digits than this are summarised instead of printed
+PRINT_DIGITS_LIMIT = 4000
+
 # ---------- Recursive Fibonacci ----------
 def fib_recursive(n):
     if n <= 1:
@@ -8,34 +17,45 @@ def fib_recursive(n):
 
 # ---------- Non-Recursive Fibonacci ----------
 def fib_non_recursive(n):
-    n1, n2 = 0, 1
-    print(n1, n2, end=" ")
-    for i in range(2, n):
-        n3 = n1 + n2
-        print(n3, end=" ")
-        n1, n2 = n2, n3
-    print()
+    return list(fib_series(n))
 
-# ---------- Main Function ----------
-def main():
-    n = int(input("Enter the number of elements: "))
+# ---------- Output Helpers ----------
+def format_term(n, value):
+    if fib_digits(n) > PRINT_DIGITS_LIMIT:
+        return f"<{fib_digits(n)} digits, {value.bit_length()} bits>"
+    return str(value)
+
+def print_term(n):
+    start = time.perf_counter()
+    value = fib(n)
+    elapsed = (time.perf_counter() - start) * 1_000_000  # microseconds
+    print(f"F({n}) = {format_term(n, value)}")
+    print(f"Fast Doubling Time Taken: {elapsed:.2f} microseconds")
+    print("Fast Doubling Time Complexity: O(log n) multiplications")
 
-    print("\nFibonacci Sequence (Recursive): ", end="")
-    start1 = time.time()
-    for i in range(n):
-        print(fib_recursive(i), end=" ")
-    end1 = time.time()
-    time_recursive = (end1 - start1) * 1_000_000  # microseconds
+def print_series(n):
+    if n <= RECURSIVE_LIMIT:
+        print("\nFibonacci Sequence (Recursive): ", end="")
+        start1 = time.perf_counter()
+        for i in range(n):
+            print(fib_recursive(i), end=" ")
+        time_recursive = (time.perf_counter() - start1) * 1_000_000  # microseconds
+    else:
+        time_recursive = None
 
     print("\n\nFibonacci Sequence (Non-Recursive): ", end="")
-    start2 = time.time()
-    fib_non_recursive(n)
-    end2 = time.time()
-    time_nonrecursive = (end2 - start2) * 1_000_000  # microseconds
+    start2 = time.perf_counter()
+    for i, value in enumerate(fib_series(n)):
+        print(format_term(i, value), end=" ")
+    print()
+    time_nonrecursive = (time.perf_counter() - start2) * 1_000_000  # microseconds
 
     # ---------- Time & Space Complexity ----------
     print("\n=== Time and Space Complexity Analysis ===")
-    print(f"Recursive Time Taken: {time_recursive:.2f} microseconds")
+    if time_recursive is None:
+        print(f"Recursive run skipped (n > {RECURSIVE_LIMIT})")
+    else:
+        print(f"Recursive Time Taken: {time_recursive:.2f} microseconds")
     print("Recursive Time Complexity: O(2^n)")
     print("Recursive Space Complexity: O(n)\n")
 
@@ -43,5 +63,21 @@ def main():
     print("Non-Recursive Time Complexity: O(n)")
     print("Non-Recursive Space Complexity: O(1)")
 
+# ---------- Main Function ----------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fibonacci numbers")
+    parser.add_argument("n", nargs="?", type=int, help="number of elements in the series")
+    parser.add_argument("--term", type=int, help="print only F(TERM), computed by fast doubling")
+    args = parser.parse_args(argv)
+
+    if args.term is not None:
+        print_term(args.term)
+        return
+
+    n = args.n
+    if n is None:
+        n = int(input("Enter the number of elements: "))
+    print_series(n)
+
 if __name__ == "__main__":
     main()
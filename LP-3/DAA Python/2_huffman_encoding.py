@@ -1,4 +1,9 @@
+import argparse
 import heapq
+import os
+
+import huffman
+import instrument
 
 # Creating Huffman tree node
 class Node:
@@ -25,8 +30,8 @@ def print_nodes(node, val=''):
         print(f"{node.symbol} -> {new_val}")
 
 
-# Main function
-if __name__ == "__main__":
+# Interactive demo: codes for user-entered frequencies
+def interactive():
     print("----- Huffman Coding -----")
 
     # Take number of symbols
@@ -62,6 +67,49 @@ if __name__ == "__main__":
     print("--------------------------------")
     print_nodes(nodes[0])
 
+
+# File compression using the streaming compressor in huffman.py
+def compress_file(in_path, out_path):
+    with instrument.recording("huffman compress") as rec:
+        bits = huffman.compress_file(in_path, out_path)
+    in_size = os.path.getsize(in_path)
+    out_size = os.path.getsize(out_path)
+    print(f"Compressed {in_size} bytes -> {out_size} bytes ({bits} payload bits)")
+    if in_size:
+        print(f"Ratio: {out_size / in_size:.3f}")
+    print(f"Heap pops / pushes: {rec.counts['heap_pops']} / {rec.counts['heap_pushes']}, "
+          f"time: {rec.elapsed_ns / 1e6:.2f} ms")
+
+
+# File decompression using the table-driven decoder in huffman.py
+def decompress_file(in_path, out_path):
+    length = huffman.decompress_file(in_path, out_path)
+    print(f"Decompressed {os.path.getsize(in_path)} bytes -> {length} bytes")
+
+
+# Main function
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Huffman coding")
+    sub = parser.add_subparsers(dest="command")
+    comp = sub.add_parser("compress", help="compress a file")
+    comp.add_argument("input")
+    comp.add_argument("output")
+    decomp = sub.add_parser("decompress", help="decompress a file written by 'compress'")
+    decomp.add_argument("input")
+    decomp.add_argument("output")
+    args = parser.parse_args(argv)
+
+    if args.command == "compress":
+        compress_file(args.input, args.output)
+    elif args.command == "decompress":
+        decompress_file(args.input, args.output)
+    else:
+        interactive()
+
+
+if __name__ == "__main__":
+    main()
+
 # ouput:
 # ----- Huffman Coding -----
 # Enter the number of characters: 3
@@ -1,3 +1,6 @@
+from knapsack import fractional_knapsack_select
+
+
 def fractional_knapsack():
     # Step 1: Take number of items
     n = int(input("Enter number of items: "))
@@ -15,23 +18,15 @@ def fractional_knapsack():
     # Step 3: Take knapsack capacity
     capacity = float(input("\nEnter knapsack capacity: "))
 
-    # Step 4: Fractional knapsack logic
-    res = 0.0
-    items = sorted(zip(weights, values), key=lambda x: x[1] / x[0], reverse=True)
+    # Step 4: Fractional knapsack logic (O(n) selection, see knapsack.py)
+    res, fractions = fractional_knapsack_select(weights, values, capacity, return_fractions=True)
 
     print("\nItem selection process:")
-    for weight, value in items:
-        if capacity <= 0:
-            break
-
-        if weight <= capacity:
-            res += value
-            capacity -= weight
+    for weight, value, fraction in zip(weights, values, fractions):
+        if fraction == 1:
             print(f"  Took full item (weight={weight}, value={value})")
-        else:
-            res += capacity * (value / weight)
-            print(f"  Took {capacity} weight fraction of item (weight={weight}, value={value})")
-            capacity = 0
+        elif fraction > 0:
+            print(f"  Took {fraction * weight} weight fraction of item (weight={weight}, value={value})")
 
     print(f"\n Maximum value in knapsack = {res:.2f}")
 
@@ -1,3 +1,7 @@
+import instrument
+from knapsack import knapsack_branch_bound, knapsack_items
+
+
 def knapsack_dp():
     # Step 1: Take user input
     n = int(input("Enter number of items: "))
@@ -13,21 +17,20 @@ def knapsack_dp():
 
     W = int(input("\nEnter maximum capacity of knapsack: "))
 
-    # Step 2: Create DP table
-    dp = [[0 for _ in range(W + 1)] for _ in range(n + 1)]
-
-    # Step 3: Build table bottom-up
-    for i in range(1, n + 1):
-        for w in range(1, W + 1):
-            if weights[i - 1] <= w:
-                include = values[i - 1] + dp[i - 1][w - weights[i - 1]]
-                exclude = dp[i - 1][w]
-                dp[i][w] = max(include, exclude)
-            else:
-                dp[i][w] = dp[i - 1][w]
-
-    # Step 4: Output result
-    print("\n Maximum profit that can be obtained:", dp[n][W])
+    # Step 2: Solve with a single rolling row (see knapsack.py)
+    with instrument.recording("0/1 knapsack DP") as dp:
+        best, chosen = knapsack_items(weights, values, W)
+
+    # Step 3: Output result
+    print("\n Maximum profit that can be obtained:", best)
+    print(" Items selected:", ", ".join(str(i + 1) for i in chosen) or "none")
+    print(f" DP rows: {dp.counts['dp_rows']}, time: {dp.elapsed_ns / 1000:.2f} microseconds")
+
+    # Step 4: Cross-check with branch and bound (does not depend on the size of W)
+    with instrument.recording("0/1 knapsack branch and bound") as rec:
+        bb = knapsack_branch_bound(weights, values, W)
+    print(f"\n Branch and bound: profit = {bb.value}, nodes explored = {rec.counts['bb_nodes']}, "
+          f"heap pushes = {rec.counts['heap_pushes']}, time: {rec.elapsed_ns / 1000:.2f} microseconds")
 
 
 if __name__ == "__main__":
@@ -1,39 +1,33 @@
+import instrument
+import nqueens
+from nqueens import board_rows, count_solutions, iter_solutions
+
 def print_board(board):
     for row in board:
         print(" ".join(str(x) for x in row))
     print()
 
-def is_safe(board, row, col, n):
-    for i in range(row):
-        if board[i][col] == 1 or \
-           (col - row + i >= 0 and board[i][col - row + i] == 1) or \
-           (col + row - i < n and board[i][col + row - i] == 1):
-            return False
-    return True
-
-def solve(board, row, n):
-    if row == n:
-        print_board(board)
-        return
-    for col in range(n):
-        if is_safe(board, row, col, n):
-            board[row][col] = 1
-            solve(board, row + 1, n)
-            board[row][col] = 0
-
 def n_queens():
     n = int(input("Enter N: "))
-    board = [[0]*n for _ in range(n)]
     r, c = map(int, input("Enter first queen position (row col): ").split())
+    fixed = {r - 1: c - 1}
+    board = [[0]*n for _ in range(n)]
     board[r-1][c-1] = 1
     print("\nInitial board:")
     print_board(board)
     print("Solutions:\n")
-    solve(board, 0, n)
+    for solution in iter_solutions(n, fixed):
+        print_board(board_rows(solution))
+    # Recursive calls and depth of the counting search, traced by instrument.py
+    with instrument.recording("N-Queens", trace=[(nqueens, "_count")]) as rec:
+        total = count_solutions(n, fixed)
+    print(f"Total solutions with this queen: {total}")
+    print(f"Recursive calls: {rec.counts['calls._count']}, max depth: {rec.max_depth}, "
+          f"time: {rec.elapsed_ns / 1000:.2f} microseconds")
 
 if __name__ == "__main__":
     n_queens()
 
 # Output:
 # Enter N: 4
-# Enter first queen position (row col): 1 2
\ No newline at end of file
+# Enter first queen position (row col): 1 2
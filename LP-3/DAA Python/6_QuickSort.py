@@ -1,53 +1,70 @@
 import random
+import sys
 
-# Global step counters
-det_steps = 0
-rand_steps = 0
+import instrument
+from sorting import introsort
 
-def partition(arr, low, high, steps_counter):
-    steps = 0
+def partition(arr, low, high):
     pivot = arr[high]
     i = low - 1
     for j in range(low, high):
-        steps += 1  # comparison
         if arr[j] <= pivot:
             i += 1
             arr[i], arr[j] = arr[j], arr[i]
     arr[i + 1], arr[high] = arr[high], arr[i + 1]
-    steps_counter[0] += steps
     return i + 1
 
-def random_partition(arr, low, high, steps_counter):
+def random_partition(arr, low, high):
     rand_index = random.randint(low, high)
     arr[rand_index], arr[high] = arr[high], arr[rand_index]  # random pivot
-    return partition(arr, low, high, steps_counter)
+    return partition(arr, low, high)
 
-def quick_sort_det(arr, low, high, steps_counter):
+def quick_sort_det(arr, low, high):
     if low < high:
-        pi = partition(arr, low, high, steps_counter)
-        quick_sort_det(arr, low, pi - 1, steps_counter)
-        quick_sort_det(arr, pi + 1, high, steps_counter)
+        pi = partition(arr, low, high)
+        quick_sort_det(arr, low, pi - 1)
+        quick_sort_det(arr, pi + 1, high)
 
-def quick_sort_rand(arr, low, high, steps_counter):
+def quick_sort_rand(arr, low, high):
     if low < high:
-        pi = random_partition(arr, low, high, steps_counter)
-        quick_sort_rand(arr, low, pi - 1, steps_counter)
-        quick_sort_rand(arr, pi + 1, high, steps_counter)
+        pi = random_partition(arr, low, high)
+        quick_sort_rand(arr, low, pi - 1)
+        quick_sort_rand(arr, pi + 1, high)
+
+def run_recorded(name, sort_fn, values):
+    # Comparisons, writes and recursion depth come from instrument.py
+    module = sys.modules[__name__]
+    with instrument.recording(name, trace=[(module, sort_fn.__name__)]) as rec:
+        data = rec.tracked(rec.keys(values))
+        getattr(module, sort_fn.__name__)(data, 0, len(data) - 1)
+    return rec.unwrap(data), rec
+
+def print_recording(title, result, rec):
+    print(f"\n{title}:", *result)
+    print("Comparisons:", rec.counts["comparisons"])
+    print("Element writes (a swap is two, an insertion-sort shift one):", rec.counts["writes"])
+    print("Max recursion depth:", rec.max_depth)
+    print(f"Time: {rec.elapsed_ns / 1000:.2f} microseconds")
 
 # --- Main program ---
 if __name__ == "__main__":
     n = int(input("Enter number of elements: "))
     arr1 = list(map(int, input("Enter elements: ").split()))
-    arr2 = arr1.copy()
-
-    det_counter = [0]
-    rand_counter = [0]
 
-    quick_sort_det(arr1, 0, n - 1, det_counter)
-    quick_sort_rand(arr2, 0, n - 1, rand_counter)
+    records = []
+    for title, sort_fn in [("Deterministic QuickSort", quick_sort_det),
+                           ("Randomized QuickSort", quick_sort_rand)]:
+        result, rec = run_recorded(title, sort_fn, arr1)
+        print_recording(title, result, rec)
+        records.append(rec)
 
-    print("\nDeterministic QuickSort:", *arr1)
-    print("Steps (approx comparisons):", det_counter[0])
+    # Introsort: 3-way partition, explicit stack, heapsort fallback (sorting.py)
+    with instrument.recording("Introsort") as rec:
+        data = rec.tracked(rec.keys(arr1))
+        introsort(data)
+    print_recording("Introsort", rec.unwrap(data), rec)
+    records.append(rec)
 
-    print("\nRandomized QuickSort:", *arr2)
-    print("Steps (approx comparisons):", rand_counter[0])
+    if len(sys.argv) > 1:
+        instrument.dump(records, sys.argv[1], indent=2)
+        print(f"\nRecordings saved to {sys.argv[1]}")
@@ -0,0 +1,288 @@
+"""
+Benchmark suite for the DAA programs
+Seeded input generators and a timing harness over the library modules
+(fibonacci, huffman, knapsack, nqueens, sorting). Every case is run at
+several sizes, repeated, and summarised as median / p95 time plus the
+tracemalloc memory high-water mark. Results can be saved as a baseline
+and later runs compared against it to catch regressions.
+
+    python benchmark.py                          # all suites, default sizes
+    python benchmark.py quicksort --repeat 9     # one suite
+    python benchmark.py nqueens --sizes 6 8      # one suite at other sizes
+    python benchmark.py --sizes nqueens:6,8 huffman:1000
+    python benchmark.py --save base.json         # record a baseline
+    python benchmark.py --compare base.json      # exit 1 on regressions
+"""
+
+import argparse
+import json
+import math
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+import fibonacci
+import huffman
+import knapsack
+import nqueens
+import sorting
+
+DEFAULT_SEED = 12345
+DEFAULT_REPEAT = 5
+DEFAULT_TOLERANCE = 0.10               # 10% slower median counts as a regression
+BRANCH_BOUND_NODES = 100_000           # node budget so hard correlated instances stay bounded
+
+
+# ---------- Input generators ----------
+def gen_array(kind, n, rng):
+    """Integer array: random, sorted, reverse or duplicate-heavy ("dups")."""
+    if kind == "random":
+        return [rng.randrange(n * 10) for _ in range(n)]
+    if kind == "sorted":
+        return list(range(n))
+    if kind == "reverse":
+        return list(range(n, 0, -1))
+    if kind == "dups":
+        return [rng.randrange(8) for _ in range(n)]
+    raise ValueError(f"unknown array kind: {kind}")
+
+
+def gen_knapsack(kind, n, rng, max_weight=1000):
+    """(weights, values, capacity) with capacity half the total weight.
+
+    "uncorrelated": values independent of weights (easy).
+    "correlated":   value = weight + constant (hard for bounding).
+    """
+    weights = [rng.randint(1, max_weight) for _ in range(n)]
+    if kind == "uncorrelated":
+        values = [rng.randint(1, max_weight) for _ in range(n)]
+    elif kind == "correlated":
+        values = [w + max_weight // 10 for w in weights]
+    else:
+        raise ValueError(f"unknown knapsack kind: {kind}")
+    return weights, values, sum(weights) // 2
+
+
+def gen_zipf_text(n, rng, alphabet=256, s=1.1):
+    """n bytes whose symbol frequencies follow a Zipf law with exponent s."""
+    symbols = list(range(alphabet))
+    rng.shuffle(symbols)
+    weights = [1 / (rank + 1) ** s for rank in range(alphabet)]
+    return bytes(rng.choices(symbols, weights, k=n))
+
+
+# ---------- Cases ----------
+# suite -> (sizes, {variant: prepare(size, rng) -> zero-argument callable to time})
+def _sort_case(kind, sort_fn):
+    def prepare(n, rng):
+        data = gen_array(kind, n, rng)
+        return lambda: sort_fn(data[:])
+    return prepare
+
+
+def _knapsack_case(kind, solver):
+    def prepare(n, rng):
+        weights, values, capacity = gen_knapsack(kind, n, rng)
+        return lambda: solver(weights, values, capacity)
+    return prepare
+
+
+def _huffman_roundtrip(n, rng):
+    text = gen_zipf_text(n, rng)
+
+    def run():
+        if huffman.decompress_bytes(huffman.compress_bytes(text)) != text:
+            raise AssertionError("Huffman round trip mismatch")
+    return run
+
+
+SUITES = {
+    "quicksort": ([1_000, 10_000, 100_000], {
+        f"{algo}/{kind}": _sort_case(kind, fn)
+        for algo, fn in [("introsort", sorting.sort), ("builtin", list.sort)]
+        for kind in ("random", "sorted", "reverse", "dups")
+    }),
+    "knapsack": ([50, 200, 1_000], {
+        f"{algo}/{kind}": _knapsack_case(kind, fn)
+        for algo, fn in [("dp", knapsack.knapsack_value),
+                         ("branch_bound", lambda w, v, c: knapsack.knapsack_branch_bound(
+                             w, v, c, max_nodes=BRANCH_BOUND_NODES)),
+                         ("fractional", knapsack.fractional_knapsack_select)]
+        for kind in ("uncorrelated", "correlated")
+    }),
+    "nqueens": ([8, 10, 12], {
+        "count": lambda n, rng: lambda: nqueens.count_solutions(n),
+        "first": lambda n, rng: lambda: nqueens.first_solution(n),
+    }),
+    "huffman": ([10_000, 100_000, 1_000_000], {
+        "roundtrip/zipf": _huffman_roundtrip,
+    }),
+    "fibonacci": ([10_000, 100_000, 1_000_000], {
+        "fast_doubling": lambda n, rng: lambda: fibonacci.fib(n),
+        "matrix": lambda n, rng: lambda: fibonacci.fib_matrix(n),
+    }),
+}
+
+
+# ---------- Measurement ----------
+def percentile(samples, q):
+    """Nearest-rank percentile of samples (0 < q <= 100)."""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def measure(prepare, size, seed, repeat):
+    """Time `repeat` runs (fresh input each) and one extra run under tracemalloc."""
+    times = []
+    for i in range(repeat):
+        run = prepare(size, random.Random(f"{seed}/{size}/{i}"))
+        start = time.perf_counter_ns()
+        run()
+        times.append(time.perf_counter_ns() - start)
+
+    run = prepare(size, random.Random(f"{seed}/{size}/mem"))
+    tracemalloc.start()
+    try:
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {
+        "median_ns": int(statistics.median(times)),
+        "p95_ns": percentile(times, 95),
+        "min_ns": min(times),
+        "peak_bytes": peak,
+        "repeat": repeat,
+    }
+
+
+def scaling_exponent(sizes, medians):
+    """Least-squares slope of log(time) against log(size): ~1 linear, ~2 quadratic."""
+    points = [(math.log(s), math.log(t)) for s, t in zip(sizes, medians) if s > 0 and t > 0]
+    if len(points) < 2:
+        return None
+    mx = statistics.fmean(x for x, _ in points)
+    my = statistics.fmean(y for _, y in points)
+    sxx = sum((x - mx) ** 2 for x, _ in points)
+    if sxx == 0:
+        return None
+    return sum((x - mx) * (y - my) for x, y in points) / sxx
+
+
+def run_suites(names, seed=DEFAULT_SEED, repeat=DEFAULT_REPEAT, sizes=None, out=sys.stdout):
+    """Run the named suites; returns {"suite/variant/size": stats}.
+
+    sizes is an optional {suite: [size, ...]} override; other suites keep
+    their default sizes.
+    """
+    results = {}
+    for name in names:
+        suite_sizes, variants = SUITES[name]
+        suite_sizes = (sizes or {}).get(name) or suite_sizes
+        print(f"\n=== {name} ===", file=out)
+        print(f"{'variant':<28}{'size':>10}{'median ms':>12}{'p95 ms':>12}{'peak KiB':>12}", file=out)
+        for variant, prepare in variants.items():
+            medians = []
+            for size in suite_sizes:
+                stats = measure(prepare, size, seed, repeat)
+                results[f"{name}/{variant}/{size}"] = stats
+                medians.append(stats["median_ns"])
+                print(f"{variant:<28}{size:>10}{stats['median_ns'] / 1e6:>12.3f}"
+                      f"{stats['p95_ns'] / 1e6:>12.3f}{stats['peak_bytes'] / 1024:>12.1f}", file=out)
+            slope = scaling_exponent(suite_sizes, medians)
+            if slope is not None:
+                print(f"{'':<28}{'scaling ~ n^%.2f' % slope:>34}", file=out)
+    return results
+
+
+# ---------- Baselines ----------
+def save_baseline(path, results, seed, repeat):
+    data = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+
+def compare(baseline, results, tolerance=DEFAULT_TOLERANCE):
+    """Cases whose median got slower than baseline * (1 + tolerance).
+
+    Returns a list of (key, old_ns, new_ns); keys missing from either side are skipped.
+    """
+    regressions = []
+    for key, stats in results.items():
+        old = baseline.get("results", {}).get(key)
+        if old and stats["median_ns"] > old["median_ns"] * (1 + tolerance):
+            regressions.append((key, old["median_ns"], stats["median_ns"]))
+    return regressions
+
+
+def parse_sizes(specs, names):
+    """{suite: sizes} from --sizes: plain sizes need exactly one suite, else suite:size,size."""
+    plain = [s for s in specs if ":" not in s]
+    if plain and len(names) != 1:
+        raise ValueError("plain --sizes need exactly one suite; use suite:size,size to size several")
+    def ints(values):
+        if not all(v.isdigit() for v in values):
+            raise ValueError(f"sizes must be positive integers, got {' '.join(values)}")
+        return [int(v) for v in values]
+
+    sizes = {names[0]: ints(plain)} if plain else {}
+    for spec in specs:
+        if ":" in spec:
+            name, _, values = spec.partition(":")
+            if name not in SUITES:
+                raise ValueError(f"unknown suite in --sizes: {name}")
+            sizes[name] = ints([v for v in values.split(",") if v])
+    return sizes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the DAA programs")
+    parser.add_argument("suites", nargs="*", help=f"suites to run (default: all of {', '.join(SUITES)})")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--sizes", nargs="+", metavar="SIZES",
+                        help="sizes for the one selected suite (e.g. 100 1000), "
+                             "or per suite as suite:size,size (e.g. nqueens:6,8)")
+    parser.add_argument("--save", metavar="PATH", help="write results as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="baseline to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+    unknown = set(args.suites) - set(SUITES)
+    if unknown:
+        parser.error(f"unknown suite(s): {', '.join(sorted(unknown))}")
+
+    names = args.suites or list(SUITES)
+    try:
+        sizes = parse_sizes(args.sizes or [], names)
+    except ValueError as e:
+        parser.error(str(e))
+
+    results = run_suites(names, args.seed, args.repeat, sizes)
+    if args.save:
+        save_baseline(args.save, results, args.seed, args.repeat)
+        print(f"\nBaseline saved to {args.save}")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, results, args.tolerance)
+        print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}")
+        for key, old, new in regressions:
+            print(f"  {key}: {old / 1e6:.3f} ms -> {new / 1e6:.3f} ms ({new / old - 1:+.1%})")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+Fibonacci engine
+Importable helpers behind 1_fibonacci_numbers.py:
+  - fib(n)            -> F(n) by fast doubling, O(log n) big-int multiplications
+  - fib_matrix(n)     -> F(n) by 2x2 matrix power (same complexity, kept for comparison)
+  - fib_series(a, b)  -> generator of F(a) .. F(b-1), O(1) additions per term
+  - fib_cached(n)     -> fib(n) behind a bounded LRU memo for repeated lookups
+"""
+
+import math
+from functools import lru_cache
+
+# Size of the memo used by fib_cached(); big terms are large ints, so keep it bounded
+CACHE_SIZE = 1024
+
+_LOG10_PHI = math.log10((1 + math.sqrt(5)) / 2)
+_LOG10_SQRT5 = math.log10(math.sqrt(5))
+
+
+def _check_index(n):
+    if n < 0:
+        raise ValueError("Fibonacci index must be non-negative")
+
+
+# ---------- Fast Doubling ----------
+def fib_pair(n):
+    """Return (F(n), F(n+1)) using the fast-doubling identities.
+
+    F(2k)   = F(k) * (2*F(k+1) - F(k))
+    F(2k+1) = F(k)^2 + F(k+1)^2
+    Bits of n are consumed from the most significant end, so no recursion is needed.
+    """
+    _check_index(n)
+    a, b = 0, 1                        # (F(0), F(1))
+    for bit in bin(n)[2:]:
+        c = a * ((b << 1) - a)         # F(2k)
+        d = a * a + b * b              # F(2k+1)
+        if bit == "1":
+            a, b = d, c + d            # step to (F(2k+1), F(2k+2))
+        else:
+            a, b = c, d
+    return a, b
+
+
+def fib(n):
+    """Return F(n) in O(log n) multiplications."""
+    return fib_pair(n)[0]
+
+
+# ---------- Matrix Power ----------
+def fib_matrix(n):
+    """Return F(n) by raising [[1, 1], [1, 0]] to the n-th power (square-and-multiply)."""
+    _check_index(n)
+    # Matrices are kept as (a, b, c) for the symmetric [[a, b], [b, c]]
+    ra, rb, rc = 1, 0, 1               # identity
+    ma, mb, mc = 1, 1, 0               # Q matrix
+    while n:
+        if n & 1:
+            ra, rb, rc = ra * ma + rb * mb, ra * mb + rb * mc, rb * mb + rc * mc
+        ma, mb, mc = ma * ma + mb * mb, mb * (ma + mc), mb * mb + mc * mc
+        n >>= 1
+    return rb
+
+
+# ---------- Streaming Series ----------
+def fib_series(start, stop=None):
+    """Yield F(start), F(start+1), ..., F(stop-1).
+
+    With a single argument the series starts at F(0), like range().
+    Only the first term is computed by fast doubling; the rest are one addition each.
+    """
+    if stop is None:
+        start, stop = 0, start
+    _check_index(start)
+    if stop <= start:
+        return
+    a, b = fib_pair(start)
+    for _ in range(stop - start):
+        yield a
+        a, b = b, a + b
+
+
+# ---------- Bounded Memo ----------
+@lru_cache(maxsize=CACHE_SIZE)
+def fib_cached(n):
+    """fib(n) memoised in an LRU cache of CACHE_SIZE entries."""
+    return fib(n)
+
+
+# ---------- Helpers ----------
+def fib_digits(n):
+    """Number of decimal digits of F(n) without converting it to a string.
+
+    Uses Binet's formula: F(n) ~ phi^n / sqrt(5).
+    """
+    _check_index(n)
+    if n < 2:
+        return 1
+    return int(n * _LOG10_PHI - _LOG10_SQRT5) + 1
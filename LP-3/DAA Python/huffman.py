@@ -0,0 +1,387 @@
+"""
+Huffman compressor
+Streaming, byte-oriented Huffman coding behind 2_huffman_encoding.py:
+  - count_frequencies(src)     -> byte histogram, read in fixed-size chunks
+  - build_huffman_tree(freq)   -> greedy tree, same algorithm as the practical
+  - canonical_codes(lengths)   -> canonical code per symbol from its code length
+  - compress(src, dst)         -> header + bit-packed payload, constant memory
+  - decompress(src, dst)       -> table-driven decoder, several symbols per lookup
+
+File format:
+  MAGIC | original length (8 bytes) | symbol count (2 bytes) |
+  (symbol, code length) byte pairs | payload bits, MSB first, zero padded
+"""
+
+import heapq
+import io
+import mmap
+import struct
+import sys
+from array import array
+from collections import Counter
+from itertools import count
+
+import numpy as np
+
+import instrument
+
+MAGIC = b"HUF1"
+HEADER = struct.Struct(">QH")          # original length, number of coded symbols
+CHUNK_SIZE = 1 << 16                   # bytes read per step while counting / encoding
+MAX_CODE_LENGTH = 24                   # longer codes are avoided by flattening frequencies
+PRIMARY_BITS = 11                      # bits indexed by the first-level decode table
+
+
+# ---------- Huffman Tree ----------
+class Node:
+    def __init__(self, freq, symbol=None, left=None, right=None):
+        self.freq = freq        # Frequency of symbol (or sum of children)
+        self.symbol = symbol    # Byte value for leaves, None for internal nodes
+        self.left = left        # Child reached with bit 0
+        self.right = right      # Child reached with bit 1
+
+    def __lt__(self, nxt):
+        return self.freq < nxt.freq
+
+
+def build_huffman_tree(char_freq):
+    """Greedy Huffman construction over a {symbol: frequency} mapping.
+
+    Ties are broken by insertion order so the tree is deterministic.
+    Returns the root Node, or None if the mapping is empty.
+    """
+    order = count()
+    heap = [(freq, next(order), Node(freq, symbol)) for symbol, freq in char_freq.items() if freq > 0]
+    heapq.heapify(heap)
+    if not heap:
+        return None
+
+    merges = len(heap) - 1
+    while len(heap) > 1:
+        f1, _, left = heapq.heappop(heap)
+        f2, _, right = heapq.heappop(heap)
+        heapq.heappush(heap, (f1 + f2, next(order), Node(f1 + f2, None, left, right)))
+    instrument.count("heap_pops", 2 * merges)     # totals only, so the loop pays nothing
+    instrument.count("heap_pushes", merges)
+    return heap[0][2]
+
+
+def code_lengths(root):
+    """Depth of every leaf, walked with an explicit stack: {symbol: length}."""
+    if root is None:
+        return {}
+    if root.symbol is not None:         # single distinct symbol still needs one bit
+        return {root.symbol: 1}
+
+    lengths = {}
+    stack = [(root, 0)]
+    while stack:
+        node, depth = stack.pop()
+        if node.symbol is not None:
+            lengths[node.symbol] = depth
+        else:
+            stack.append((node.left, depth + 1))
+            stack.append((node.right, depth + 1))
+    return lengths
+
+
+def limited_code_lengths(char_freq, max_length=MAX_CODE_LENGTH):
+    """Huffman code lengths no longer than max_length.
+
+    When the optimal tree is too deep, frequencies are halved (never below 1)
+    and the tree rebuilt; this only triggers on very skewed inputs.
+    """
+    freq = {symbol: f for symbol, f in char_freq.items() if f > 0}
+    while True:
+        lengths = code_lengths(build_huffman_tree(freq))
+        if not lengths or max(lengths.values()) <= max_length:
+            return lengths
+        freq = {symbol: (f >> 1) | 1 for symbol, f in freq.items()}
+
+
+# ---------- Canonical Codes ----------
+def canonical_codes(lengths):
+    """Assign canonical codes: shorter codes first, ties ordered by symbol.
+
+    Returns {symbol: (code, length)}. Only the lengths need to be stored,
+    the decoder rebuilds the same codes from them.
+    """
+    codes = {}
+    code = 0
+    prev_len = 0
+    for symbol, length in sorted(lengths.items(), key=lambda item: (item[1], item[0])):
+        code <<= length - prev_len
+        codes[symbol] = (code, length)
+        code += 1
+        prev_len = length
+    return codes
+
+
+def write_header(dst, original_length, lengths):
+    dst.write(MAGIC)
+    dst.write(HEADER.pack(original_length, len(lengths)))
+    dst.write(bytes(b for symbol in sorted(lengths) for b in (symbol, lengths[symbol])))
+
+
+def read_header(src):
+    """Inverse of write_header(): returns (original_length, {symbol: length})."""
+    if src.read(len(MAGIC)) != MAGIC:
+        raise ValueError("not a Huffman stream (bad magic)")
+    raw = src.read(HEADER.size)
+    if len(raw) != HEADER.size:
+        raise ValueError("truncated Huffman header")
+    original_length, n_symbols = HEADER.unpack(raw)
+    table = src.read(2 * n_symbols)
+    if len(table) != 2 * n_symbols:
+        raise ValueError("truncated Huffman header")
+    return original_length, dict(zip(table[0::2], table[1::2]))
+
+
+# ---------- Streaming ----------
+def iter_chunks(src, chunk_size=CHUNK_SIZE):
+    """Yield successive chunks from a binary file object (or mmap)."""
+    while True:
+        chunk = src.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def count_frequencies(src, chunk_size=CHUNK_SIZE):
+    """Byte histogram of a stream, returned as {byte: count}."""
+    freq = Counter()
+    for chunk in iter_chunks(src, chunk_size):
+        freq.update(chunk)
+    return freq
+
+
+class BitWriter:
+    """Packs integer codes into bytes, carrying the unfinished byte between chunks."""
+
+    def __init__(self, dst):
+        self.dst = dst
+        self.pending = 0                # value of the fewer than 8 leftover bits
+        self.pending_bits = 0
+        self.bits_written = 0
+
+    def write_codes(self, codes, lengths):
+        """Append codes[i] as a lengths[i]-bit big-endian field, for every i, in order.
+
+        Each code (at most MAX_CODE_LENGTH bits) is shifted into the 32-bit
+        window that starts at the byte holding its first bit; the four bytes
+        of every window are summed into the output with bincount, which is an
+        OR because no two codes share a bit.
+        """
+        codes = np.concatenate(([self.pending], codes)).astype(np.uint64)
+        lengths = np.concatenate(([self.pending_bits], lengths)).astype(np.int64)
+        ends = np.cumsum(lengths)
+        starts = ends - lengths
+        total = int(ends[-1])
+        window = codes << (32 - lengths - (starts & 7)).astype(np.uint64)
+        first = starts >> 3
+        out = np.zeros(((total + 7) >> 3) + 4)
+        for k in range(4):
+            part = (window >> np.uint64(24 - 8 * k)) & np.uint64(0xFF)
+            out[:len(out) - 3 + k] += np.bincount(first + k, weights=part.astype(np.float64),
+                                                  minlength=len(out) - 3 + k)[:len(out) - 3 + k]
+        out = out.astype(np.uint8)
+        whole = total >> 3
+        if whole:
+            self.dst.write(out[:whole].tobytes())
+        self.pending_bits = total & 7
+        self.pending = int(out[whole]) >> (8 - self.pending_bits) if self.pending_bits else 0
+        self.bits_written += whole << 3
+
+    def flush(self):
+        if self.pending_bits:
+            self.dst.write(bytes([self.pending << (8 - self.pending_bits)]))   # zero padded
+            self.bits_written += self.pending_bits
+            self.pending = self.pending_bits = 0
+
+
+def encode_table(codes):
+    """Per-byte lookup arrays (codes, lengths), indexed by byte value."""
+    table = np.zeros(256, dtype=np.uint32)
+    lengths = np.zeros(256, dtype=np.uint8)
+    for symbol, (code, length) in codes.items():
+        table[symbol] = code
+        lengths[symbol] = length
+    return table, lengths
+
+
+def compress(src, dst, chunk_size=CHUNK_SIZE):
+    """Compress a seekable binary stream into dst. Returns the payload size in bits.
+
+    The source is read twice (histogram, then encoding), one chunk at a time,
+    so memory use is bounded by chunk_size regardless of the input size.
+    """
+    start = src.tell()
+    freq = count_frequencies(src, chunk_size)
+    original_length = sum(freq.values())
+    lengths = limited_code_lengths(freq)
+    write_header(dst, original_length, lengths)
+
+    table, code_lengths = encode_table(canonical_codes(lengths))
+    writer = BitWriter(dst)
+    src.seek(start)
+    for chunk in iter_chunks(src, chunk_size):
+        symbols = np.frombuffer(chunk, dtype=np.uint8)
+        writer.write_codes(table[symbols], code_lengths[symbols])
+    writer.flush()
+    return writer.bits_written
+
+
+def compress_bytes(data):
+    """Compress an in-memory bytes-like object, returning the compressed bytes."""
+    out = io.BytesIO()
+    compress(io.BytesIO(data), out)
+    return out.getvalue()
+
+
+def compress_file(in_path, out_path, chunk_size=CHUNK_SIZE):
+    """Compress in_path to out_path, reading the input through mmap."""
+    with open(in_path, "rb") as fin, open(out_path, "wb") as fout:
+        try:
+            src = mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:              # empty files cannot be mapped
+            return compress(fin, fout, chunk_size)
+        with src:
+            return compress(src, fout, chunk_size)
+
+
+# ---------- Table-Driven Decoding ----------
+class DecodeTable:
+    """Lookup tables that decode PRIMARY_BITS of input per step.
+
+    Each primary entry holds every whole symbol that fits in its k-bit index
+    (as bytes) and the number of bits they use. Indexes that start with a
+    code longer than k bits point to an overflow subtable instead, indexed by
+    the following bits, holding a single (symbol, length) per entry.
+    """
+
+    def __init__(self, lengths, primary_bits=PRIMARY_BITS):
+        self.k = k = primary_bits
+        self.max_length = max(lengths.values(), default=0)
+        self.window = max(k, self.max_length)       # bits that must be buffered per lookup
+        codes = canonical_codes(lengths)
+        by_code = {(length, code): symbol for symbol, (code, length) in codes.items()}
+        min_length = min(lengths.values(), default=1)
+
+        self.primary = primary = [None] * (1 << k)
+        for idx in range(1 << k):
+            symbols = bytearray()
+            pos = 0
+            while True:
+                for length in range(min_length, k - pos + 1):
+                    code = (idx >> (k - pos - length)) & ((1 << length) - 1)
+                    symbol = by_code.get((length, code))
+                    if symbol is not None:
+                        symbols.append(symbol)
+                        pos += length
+                        break
+                else:
+                    break
+            if symbols:
+                primary[idx] = (bytes(symbols), pos, None)
+
+        # Overflow subtables, one per k-bit prefix of the longer codes
+        long_codes = {}
+        for symbol, (code, length) in codes.items():
+            if length > k:
+                long_codes.setdefault(code >> (length - k), []).append((symbol, code, length))
+        for prefix, group in long_codes.items():
+            if primary[prefix] is not None:
+                continue
+            sub_bits = max(length for _, _, length in group) - k
+            sub = [None] * (1 << sub_bits)
+            for symbol, code, length in group:
+                rest = length - k
+                first = (code & ((1 << rest) - 1)) << (sub_bits - rest)
+                for j in range(first, first + (1 << (sub_bits - rest))):
+                    sub[j] = (symbol, length)
+            primary[prefix] = (b"", k, (sub, sub_bits))
+
+
+def decode_words(table, words, state, out, limit):
+    """Decode 32-bit big-endian words into out until it holds limit symbols.
+
+    state is [acc, nbits] and carries the undecoded bits between calls.
+    """
+    primary = table.primary
+    k = table.k
+    mask = (1 << k) - 1
+    window = table.window
+    acc, nbits = state
+    for word in words:
+        acc = ((acc & ((1 << nbits) - 1)) << 32) | word
+        nbits += 32
+        while nbits >= window:
+            entry = primary[(acc >> (nbits - k)) & mask]
+            if entry is None:
+                raise ValueError("corrupt Huffman stream (invalid code)")
+            symbols, used, sub = entry
+            if sub is None:
+                out += symbols
+                nbits -= used
+            else:
+                sub_table, sub_bits = sub
+                hit = sub_table[(acc >> (nbits - k - sub_bits)) & ((1 << sub_bits) - 1)]
+                if hit is None:
+                    raise ValueError("corrupt Huffman stream (invalid code)")
+                out.append(hit[0])
+                nbits -= hit[1]
+        if len(out) >= limit:
+            break
+    state[0], state[1] = acc, nbits
+
+
+def _words(data):
+    """Big-endian 32-bit words of data, zero padded to a multiple of 4 bytes."""
+    if len(data) & 3:
+        data = bytes(data) + bytes(4 - (len(data) & 3))
+    words = array("I")
+    words.frombytes(data)
+    if sys.byteorder == "little":
+        words.byteswap()
+    return words
+
+
+def decompress(src, dst, chunk_size=CHUNK_SIZE, primary_bits=PRIMARY_BITS):
+    """Decompress a stream written by compress(). Returns the decoded length."""
+    total, lengths = read_header(src)
+    if total == 0:
+        return 0
+    table = DecodeTable(lengths, primary_bits)
+    chunk_size -= chunk_size & 3               # keep words aligned across chunks
+    state = [0, 0]
+    out = bytearray()
+    written = 0
+    eof = False
+    while written < total:
+        chunk = src.read(chunk_size)
+        if not chunk:
+            if eof:
+                raise ValueError("truncated Huffman stream")
+            # Zero words let the last real bits fill a whole lookup window
+            eof = True
+            chunk = bytes(8 + (table.window >> 3))
+        decode_words(table, _words(chunk), state, out, total - written)
+        if len(out) > total - written:
+            del out[total - written:]          # drop symbols decoded from padding
+        dst.write(out)
+        written += len(out)
+        out.clear()
+    return written
+
+
+def decompress_bytes(data):
+    """Decompress bytes produced by compress_bytes()."""
+    out = io.BytesIO()
+    decompress(io.BytesIO(data), out)
+    return out.getvalue()
+
+
+def decompress_file(in_path, out_path, chunk_size=CHUNK_SIZE):
+    """Decompress in_path to out_path. Returns the decoded length."""
+    with open(in_path, "rb") as fin, open(out_path, "wb") as fout:
+        return decompress(fin, fout, chunk_size)
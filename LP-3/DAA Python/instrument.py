@@ -0,0 +1,232 @@
+"""
+Instrumentation for the DAA programs
+Counts comparisons, element writes (swaps), allocations, calls and maximum
+recursion depth, and times phases with perf_counter_ns. Nothing is hooked
+into the algorithms themselves: the data passed in is wrapped, and traced
+functions are patched in only for the duration of a recording, so an
+algorithm runs at full speed whenever it is not being recorded.
+
+    with recording("quicksort", trace=[(module, "quick_sort_det")]) as rec:
+        data = rec.tracked(rec.keys(values))   # counts comparisons and writes
+        module.quick_sort_det(data, 0, len(data) - 1)
+    print(rec.to_json())
+
+  - recording(name, trace)  -> context manager yielding a Recorder
+  - recorded(name, sink)    -> decorator recording every call of a function
+  - count(event, n)         -> manual counter, a no-op outside a recording;
+                               knapsack.py ("dp_rows", "bb_nodes",
+                               "heap_pushes") and huffman.py ("heap_pops",
+                               "heap_pushes") report their totals through it
+  - dump(records, path)     -> write several recordings as one JSON file
+"""
+
+import functools
+import json
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+
+_current = None                        # Recorder of the innermost active recording
+
+
+# ---------- Wrapped data ----------
+class _Counted:
+    """Value wrapper that reports every comparison to its recorder."""
+
+    __slots__ = ("value", "counts")
+
+    def __init__(self, value, counts):
+        self.value = value
+        self.counts = counts
+
+    def __lt__(self, other):
+        self.counts["comparisons"] += 1
+        return self.value < other.value
+
+    def __le__(self, other):
+        self.counts["comparisons"] += 1
+        return self.value <= other.value
+
+    def __gt__(self, other):
+        self.counts["comparisons"] += 1
+        return self.value > other.value
+
+    def __ge__(self, other):
+        self.counts["comparisons"] += 1
+        return self.value >= other.value
+
+    def __eq__(self, other):
+        self.counts["comparisons"] += 1
+        return self.value == other.value
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self.value)
+
+
+class _TrackedList(list):
+    """list that counts item assignments; a swap is two writes."""
+
+    def __init__(self, items, counts):
+        super().__init__(items)
+        self.counts = counts
+
+    def __setitem__(self, index, value):
+        self.counts["writes"] += 1
+        super().__setitem__(index, value)
+
+
+# ---------- Recorder ----------
+class Recorder:
+    """Counters and timings of one recording."""
+
+    def __init__(self, name):
+        self.name = name
+        self.counts = Counter()
+        self.sections = {}             # section name -> total ns
+        self.max_depth = 0
+        self.elapsed_ns = 0
+        self.allocated_blocks = 0      # net change in live Python memory blocks
+        self.peak_bytes = None
+        self._depth = 0
+
+    def keys(self, values):
+        """Wrap values so comparisons between them are counted."""
+        counts = self.counts
+        return [_Counted(v, counts) for v in values]
+
+    def tracked(self, values):
+        """Copy values into a list that counts element writes."""
+        return _TrackedList(values, self.counts)
+
+    @staticmethod
+    def unwrap(values):
+        """Plain values back from keys() / tracked()."""
+        return [v.value if isinstance(v, _Counted) else v for v in values]
+
+    @contextmanager
+    def section(self, name):
+        """Time a phase of the algorithm (accumulates over repeated entries)."""
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.sections[name] = self.sections.get(name, 0) + time.perf_counter_ns() - start
+
+    def _wrap(self, fn):
+        """Function wrapper counting calls and tracking the recursion depth."""
+        counts = self.counts
+        key = "calls." + fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            counts[key] += 1
+            self._depth += 1
+            if self._depth > self.max_depth:
+                self.max_depth = self._depth
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._depth -= 1
+        return wrapper
+
+    def to_dict(self):
+        data = {
+            "name": self.name,
+            "elapsed_ns": self.elapsed_ns,
+            "counts": dict(self.counts),
+            "sections_ns": dict(self.sections),
+            "max_depth": self.max_depth,
+            "allocated_blocks": self.allocated_blocks,
+        }
+        if self.peak_bytes is not None:
+            data["peak_bytes"] = self.peak_bytes
+        return data
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.to_dict(), **kwargs)
+
+
+@contextmanager
+def recording(name, trace=(), track_memory=False):
+    """Record one run.
+
+    trace is a list of (module_or_class, function_name) pairs; those
+    attributes are replaced by counting wrappers until the block exits, so
+    recursive calls made through the module are counted too. Each wrapper
+    adds one frame per traced call, so the recursion limit is doubled while
+    tracing: a traced run fails at the same input size as an untraced one.
+    track_memory turns on tracemalloc for a peak-bytes figure (slow).
+    """
+    global _current
+    rec = Recorder(name)
+    originals = []
+    for owner, attr in trace:
+        fn = getattr(owner, attr)
+        originals.append((owner, attr, fn))
+        setattr(owner, attr, rec._wrap(fn))
+    recursion_limit = sys.getrecursionlimit()
+    if originals:
+        sys.setrecursionlimit(2 * recursion_limit)
+
+    started_tracing = track_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    if track_memory:
+        tracemalloc.reset_peak()
+
+    outer, _current = _current, rec
+    blocks = sys.getallocatedblocks()
+    start = time.perf_counter_ns()
+    try:
+        yield rec
+    finally:
+        rec.elapsed_ns = time.perf_counter_ns() - start
+        rec.allocated_blocks = sys.getallocatedblocks() - blocks
+        _current = outer
+        if track_memory:
+            rec.peak_bytes = tracemalloc.get_traced_memory()[1]
+        if started_tracing:
+            tracemalloc.stop()
+        for owner, attr, fn in reversed(originals):
+            setattr(owner, attr, fn)
+        if originals:
+            sys.setrecursionlimit(recursion_limit)
+
+
+def recorded(name=None, sink=None, **options):
+    """Decorator form of recording(): every call is recorded into sink (a list).
+
+    Without a sink the recordings are kept on the wrapper's `.records` list.
+    """
+    def decorate(fn):
+        records = sink if sink is not None else []
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with recording(name or fn.__name__, **options) as rec:
+                result = fn(*args, **kwargs)
+            records.append(rec)
+            return result
+
+        wrapper.records = records
+        return wrapper
+    return decorate
+
+
+def count(event, n=1):
+    """Add n to a named counter of the active recording, if any."""
+    if _current is not None:
+        _current.counts[event] += n
+
+
+def dump(records, path=None, **kwargs):
+    """Serialise recordings as a JSON list; written to path when given."""
+    text = json.dumps([r.to_dict() for r in records], **kwargs)
+    if path is not None:
+        with open(path, "w") as f:
+            f.write(text)
+    return text
@@ -0,0 +1,316 @@
+"""
+Knapsack solvers
+Library behind 3_fractional_knapsack.py and 4_0_1_knapsack.py:
+  - fractional_knapsack(weights, values, W) -> greedy optimum of the fractional problem
+  - fractional_knapsack_select(weights, values, W) -> same optimum in O(n) by weighted-median selection
+  - FractionalKnapsackIndex(weights, values).query(Ws) -> many capacities against one item set
+  - knapsack_value(weights, values, W)  -> best value with one rolling 1-D NumPy array
+  - knapsack_items(weights, values, W)  -> (best value, chosen item indices)
+  - knapsack_branch_bound(weights, values, W) -> best-first branch and bound, any capacity
+
+The rolling row is updated per item as
+    row[w:] = maximum(row[w:], row[:-w] + v)
+which is one vectorised pass instead of a Python loop over capacities.
+Memory is O(W) values plus one bit per (item, capacity) decision, packed
+with np.packbits, instead of the (n+1) x (W+1) list-of-lists table.
+"""
+
+import heapq
+import time
+from bisect import bisect_right
+from collections import namedtuple
+from itertools import accumulate, count
+
+import numpy as np
+
+import instrument
+
+BranchBoundResult = namedtuple("BranchBoundResult", "value items optimal nodes elapsed")
+
+
+def _as_arrays(weights, values, capacity):
+    weights = np.asarray(weights, dtype=np.int64)
+    values = np.asarray(values, dtype=np.int64)
+    if weights.shape != values.shape or weights.ndim != 1:
+        raise ValueError("weights and values must be 1-D sequences of equal length")
+    if capacity < 0 or (weights < 0).any():
+        raise ValueError("capacity and weights must be non-negative")
+    return weights, values, int(capacity)
+
+
+# ---------- Fractional (greedy) ----------
+def fractional_knapsack(weights, values, capacity):
+    """Greedy fractional knapsack: take items by value/weight ratio, the last one partly.
+
+    Same strategy as the practical, without printing; returns the total value.
+    """
+    res = 0.0
+    items = sorted(zip(weights, values), key=lambda x: x[1] / x[0] if x[0] else float("inf"), reverse=True)
+    for weight, value in items:
+        if capacity <= 0:
+            break
+        if weight <= capacity:
+            res += value
+            capacity -= weight
+        else:
+            res += capacity * (value / weight)
+            capacity = 0
+    return res
+
+
+def _as_float_arrays(weights, values):
+    weights = np.asarray(weights, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    if weights.shape != values.shape or weights.ndim != 1:
+        raise ValueError("weights and values must be 1-D sequences of equal length")
+    return weights, values
+
+
+def fractional_knapsack_select(weights, values, capacity, return_fractions=False):
+    """Fractional knapsack optimum in expected O(n), without sorting.
+
+    The optimum takes every item whose ratio is above a critical ratio r*,
+    part of the items at r*, and nothing below it. r* is found by weighted
+    selection: partition the candidates around their median ratio, keep the
+    half that still straddles the remaining capacity, repeat.
+
+    Returns the total value, or (value, fractions) with the taken fraction of
+    every item when return_fractions is True.
+
+    Rounding leftovers never count as spare capacity (regression check):
+    >>> round(fractional_knapsack_select([0.8, 0.1, 0.8, 0.5, 0.8, 0.2, 0.1],
+    ...                                  [3.5, 1.3, 3.0, 1.1, 2.6, 4.3, 7.2], 0.4), 10)
+    12.8
+    """
+    weights, values = _as_float_arrays(weights, values)
+    fractions = np.zeros(len(weights))
+    free = (weights <= 0) & (values > 0)                 # zero-weight items cost nothing
+    fractions[free] = 1.0
+    useful = np.flatnonzero((weights > 0) & (values > 0))
+    ratio = np.zeros(len(weights))
+    ratio[useful] = values[useful] / weights[useful]
+
+    # Invariant: every item with ratio above the current candidates is taken whole
+    room = float(capacity)
+    cand = useful
+    critical = np.inf
+    eq_fraction = 0.0
+    if weights[useful].sum() <= room:
+        # Everything fits; decided up front, since float rounding can leave a
+        # tiny positive room after the loop below has used up its candidates
+        critical, eq_fraction = 0.0, 1.0
+        cand = cand[:0]
+    while len(cand) and room > 0:
+        r = ratio[cand]
+        pivot = np.partition(r, len(r) // 2)[len(r) // 2]
+        high = cand[r > pivot]
+        w_high = weights[high].sum()
+        if w_high >= room:
+            cand = high
+            continue
+        eq = cand[r == pivot]
+        w_eq = weights[eq].sum()
+        room -= w_high
+        if w_eq >= room:
+            critical = pivot
+            eq_fraction = room / w_eq
+            room = 0.0
+            break
+        room -= w_eq
+        critical = pivot
+        eq_fraction = 1.0
+        cand = cand[r < pivot]
+
+    fractions[useful] = np.where(ratio[useful] > critical, 1.0,
+                                 np.where(ratio[useful] == critical, eq_fraction, 0.0))
+    value = float(fractions @ values)
+    if return_fractions:
+        return value, fractions
+    return value
+
+
+class FractionalKnapsackIndex:
+    """Item set prepared once for many fractional-knapsack capacity queries.
+
+    Items are sorted by ratio once (O(n log n)); each query is then a binary
+    search in the prefix sums of the sorted weights, O(log n) per capacity.
+    """
+
+    def __init__(self, weights, values):
+        weights, values = _as_float_arrays(weights, values)
+        self.free_value = float(values[(weights <= 0) & (values > 0)].sum())
+        useful = (weights > 0) & (values > 0)
+        w, v = weights[useful], values[useful]
+        order = np.argsort(-(v / w), kind="stable")
+        self.ratio = np.append((v / w)[order], 0.0)        # sentinel: nothing left to take
+        self.prefix_weight = np.concatenate(([0.0], np.cumsum(w[order])))
+        self.prefix_value = np.concatenate(([0.0], np.cumsum(v[order])))
+
+    def query(self, capacities):
+        """Optimal value for every capacity in capacities (scalar or array)."""
+        caps = np.asarray(capacities, dtype=np.float64)
+        if (caps < 0).any():
+            raise ValueError("capacities must be non-negative")
+        j = np.searchsorted(self.prefix_weight, caps, side="right") - 1    # items 0..j-1 fit whole
+        result = self.prefix_value[j] + (caps - self.prefix_weight[j]) * self.ratio[j] + self.free_value
+        return result if result.ndim else float(result)
+
+
+# ---------- Value only ----------
+def knapsack_value(weights, values, capacity):
+    """Maximum total value; O(nW) time, O(W) memory."""
+    weights, values, capacity = _as_arrays(weights, values, capacity)
+    row = np.zeros(capacity + 1, dtype=np.int64)
+    for w, v in zip(weights.tolist(), values.tolist()):
+        if w > capacity:
+            continue
+        if w == 0:
+            row += max(v, 0)
+            continue
+        # RHS is evaluated before assignment, so every item is used at most once
+        np.maximum(row[w:], row[:-w] + v, out=row[w:])
+    instrument.count("dp_rows", len(weights))
+    return int(row[capacity])
+
+
+# ---------- Value and chosen items ----------
+def knapsack_items(weights, values, capacity):
+    """Maximum value and the indices of the items that achieve it.
+
+    One row of decisions ("item i improves capacity c") is kept per item as a
+    packed bitset, so reconstruction costs n * (W+1) / 8 bytes in total.
+    """
+    weights, values, capacity = _as_arrays(weights, values, capacity)
+    n = len(weights)
+    row = np.zeros(capacity + 1, dtype=np.int64)
+    decisions = np.zeros((n, (capacity + 8) // 8), dtype=np.uint8)
+
+    for i, (w, v) in enumerate(zip(weights.tolist(), values.tolist())):
+        if w > capacity or v <= 0:
+            continue
+        if w == 0:
+            row += v
+            decisions[i] = 0xFF
+            continue
+        candidate = row[:-w] + v
+        take = candidate > row[w:]
+        row[w:][take] = candidate[take]
+        decisions[i] = np.packbits(np.concatenate((np.zeros(w, dtype=bool), take)))
+
+    # Walk the decisions backwards from the full capacity
+    chosen = []
+    c = capacity
+    for i in range(n - 1, -1, -1):
+        if (decisions[i, c >> 3] >> (7 - (c & 7))) & 1:
+            chosen.append(i)
+            c -= int(weights[i])
+    chosen.reverse()
+    instrument.count("dp_rows", n)
+    return int(row[capacity]), chosen
+
+
+# ---------- Branch and Bound ----------
+class _FractionalBound:
+    """fractional_knapsack() over a ratio-sorted suffix of the items, in O(log n).
+
+    Prefix sums of the sorted weights/values let the greedy find its critical
+    (partly taken) item with one binary search instead of a scan.
+    """
+
+    def __init__(self, weights, values):
+        self.weights = weights
+        self.values = values
+        self.pw = [0] + list(accumulate(weights))
+        self.pv = [0] + list(accumulate(values))
+
+    def __call__(self, start, capacity):
+        pw, pv = self.pw, self.pv
+        j = bisect_right(pw, pw[start] + capacity) - 1     # items start..j-1 fit whole
+        bound = pv[j] - pv[start]
+        if j < len(self.weights):
+            bound += (capacity - (pw[j] - pw[start])) * self.values[j] / self.weights[j]
+        return bound
+
+
+def knapsack_branch_bound(weights, values, capacity, max_nodes=None, time_limit=None,
+                          on_incumbent=None):
+    """Best-first branch and bound for 0/1 knapsack with real-valued weights.
+
+    Nodes are expanded in order of their fractional_knapsack() upper bound;
+    the search ends as soon as no open node can beat the incumbent. Work is
+    independent of the capacity's magnitude, unlike the DP.
+
+    max_nodes / time_limit (seconds) cap the search; the best solution found
+    so far is returned with optimal=False. on_incumbent(value, items, elapsed)
+    is called whenever a better solution is found.
+    """
+    if capacity < 0:
+        raise ValueError("capacity must be non-negative")
+    start_time = time.perf_counter()
+
+    # Zero-weight items are always worth taking; non-positive values never are
+    free = [i for i, (w, v) in enumerate(zip(weights, values)) if w <= 0 and v > 0]
+    order = sorted((i for i, (w, v) in enumerate(zip(weights, values)) if w > 0 and v > 0),
+                   key=lambda i: values[i] / weights[i], reverse=True)
+    base = sum(values[i] for i in free)
+    ws = [weights[i] for i in order]
+    vs = [values[i] for i in order]
+    n = len(order)
+    bound = _FractionalBound(ws, vs)
+
+    def items_of(path):
+        chosen = list(free)
+        while path is not None:
+            level, path = path
+            chosen.append(order[level])
+        return sorted(chosen)
+
+    # Greedy integer solution as the first incumbent
+    best_value, best_path, room = 0, None, capacity
+    for level in range(n):
+        if ws[level] <= room:
+            room -= ws[level]
+            best_value += vs[level]
+            best_path = (level, best_path)
+
+    def report():
+        if on_incumbent is not None:
+            on_incumbent(base + best_value, items_of(best_path), time.perf_counter() - start_time)
+
+    report()
+
+    # Frontier entries: (-bound, tie, level, room, value, path); path is a linked list of taken levels
+    tie = count()
+    frontier = [(-bound(0, capacity), next(tie), 0, capacity, 0, None)]
+    nodes = 0
+    optimal = True
+    while frontier:
+        neg_bound, _, level, room, value, path = heapq.heappop(frontier)
+        if -neg_bound <= best_value:
+            break                                   # nothing left can improve
+        if (max_nodes is not None and nodes >= max_nodes) or \
+           (time_limit is not None and time.perf_counter() - start_time >= time_limit):
+            optimal = False
+            break
+        nodes += 1
+        if level == n:
+            continue
+
+        # Include: the bound is unchanged, the greedy already took this item whole
+        if ws[level] <= room:
+            taken = (level, path)
+            value_in = value + vs[level]
+            if value_in > best_value:
+                best_value, best_path = value_in, taken
+                report()
+            heapq.heappush(frontier, (neg_bound, next(tie), level + 1, room - ws[level], value_in, taken))
+
+        # Exclude
+        ub = value + bound(level + 1, room)
+        if ub > best_value:
+            heapq.heappush(frontier, (-ub, next(tie), level + 1, room, value, path))
+
+    instrument.count("bb_nodes", nodes)
+    instrument.count("heap_pushes", next(tie))
+    return BranchBoundResult(base + best_value, items_of(best_path), optimal, nodes,
+                             time.perf_counter() - start_time)
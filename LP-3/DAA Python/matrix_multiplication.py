@@ -0,0 +1,190 @@
+"""
+Mini Project 7
+Title: Matrix Multiplication - single-threaded, blocked, NumPy and multi-process
+Aim: To compare the naive triple loop and one-thread-per-row version with
+implementations that actually use the cache and the CPU cores.
+
+  - matrix_multiply(A, B)              -> naive i-j-k triple loop (reference)
+  - matrix_multiply_multithreaded(A, B)-> one thread per row (GIL-bound, reference)
+  - matrix_multiply_blocked(A, B)      -> cache-blocked i-k-j tiles on lists
+  - matrix_multiply_numpy(A, B)        -> NumPy fast path
+  - matrix_multiply_parallel(A, B)     -> row blocks over a fixed process pool,
+                                          operands in multiprocessing.shared_memory
+"""
+
+import os
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+BLOCK_SIZE = 64                        # tile edge for the blocked list version
+
+
+# --- Reference: single-threaded triple loop ---
+def matrix_multiply(A, B):
+    n = len(A)
+    m = len(B[0])
+    p = len(B)
+    result = [[0 for _ in range(m)] for _ in range(n)]
+
+    for i in range(n):
+        for j in range(m):
+            for k in range(p):
+                result[i][j] += A[i][k] * B[k][j]
+    return result
+
+
+# --- Reference: one thread per row ---
+def multiply_row(A, B, result, row):
+    n = len(B[0])
+    p = len(B)
+    for j in range(n):
+        for k in range(p):
+            result[row][j] += A[row][k] * B[k][j]
+
+
+def matrix_multiply_multithreaded(A, B):
+    n = len(A)
+    m = len(B[0])
+    result = [[0 for _ in range(m)] for _ in range(n)]
+    threads = []
+
+    for i in range(n):
+        t = threading.Thread(target=multiply_row, args=(A, B, result, i))
+        t.start()
+        threads.append(t)
+
+    for t in threads:
+        t.join()
+
+    return result
+
+
+# --- Cache-blocked multiplication on lists ---
+def matrix_multiply_blocked(A, B, block=BLOCK_SIZE):
+    """Tiled i-k-j multiplication: each B row tile is reused across a block of A rows.
+
+    The innermost loop walks a contiguous row of B and of the result, instead
+    of striding down a column of B as the naive j-k order does.
+    """
+    n, p, m = len(A), len(B), len(B[0])
+    result = [[0] * m for _ in range(n)]
+    for ii in range(0, n, block):
+        for kk in range(0, p, block):
+            for jj in range(0, m, block):
+                j_end = min(jj + block, m)
+                for i in range(ii, min(ii + block, n)):
+                    row_a = A[i]
+                    row_c = result[i]
+                    for k in range(kk, min(kk + block, p)):
+                        a = row_a[k]
+                        if a:
+                            row_b = B[k]
+                            for j in range(jj, j_end):
+                                row_c[j] += a * row_b[j]
+    return result
+
+
+# --- NumPy fast path ---
+def matrix_multiply_numpy(A, B):
+    return np.asarray(A) @ np.asarray(B)
+
+
+# --- Multi-process multiplication over shared memory ---
+_shared = {}                           # per-worker views of the shared operands
+
+
+def _attach(name, shape, dtype):
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _init_worker(a_spec, b_spec, c_spec):
+    # Attach once per worker; tasks then only carry row ranges
+    for key, spec in (("A", a_spec), ("B", b_spec), ("C", c_spec)):
+        _shared[key] = _attach(*spec)
+
+
+def _multiply_rows(bounds):
+    start, stop = bounds
+    A, B, C = _shared["A"][1], _shared["B"][1], _shared["C"][1]
+    np.matmul(A[start:stop], B, out=C[start:stop])
+    return stop - start
+
+
+def _to_shared(array):
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    view = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+    view[...] = array
+    return shm, view
+
+
+def matrix_multiply_parallel(A, B, workers=None, block_rows=None):
+    """A @ B with row blocks computed by a fixed-size process pool.
+
+    A, B and the result live in shared memory, so workers read and write them
+    in place and nothing but (start, stop) row ranges is pickled.
+    """
+    A = np.asarray(A)
+    B = np.asarray(B)
+    if A.ndim != 2 or B.ndim != 2 or A.shape[1] != B.shape[0]:
+        raise ValueError(f"cannot multiply shapes {A.shape} and {B.shape}")
+    dtype = np.result_type(A, B)
+    workers = workers or os.cpu_count() or 1
+    n = A.shape[0]
+    # A few blocks per worker so uneven progress still balances out
+    block_rows = block_rows or max(1, -(-n // (4 * workers)))
+
+    segments = []
+    try:
+        shm_a, _ = _to_shared(A.astype(dtype, copy=False))
+        segments.append(shm_a)
+        shm_b, _ = _to_shared(B.astype(dtype, copy=False))
+        segments.append(shm_b)
+        shm_c, C = _to_shared(np.zeros((n, B.shape[1]), dtype=dtype))
+        segments.append(shm_c)
+
+        specs = ((shm_a.name, A.shape, dtype), (shm_b.name, B.shape, dtype), (shm_c.name, C.shape, dtype))
+        bounds = [(s, min(s + block_rows, n)) for s in range(0, n, block_rows)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=specs) as pool:
+            for _ in pool.map(_multiply_rows, bounds):
+                pass
+        return C.copy()
+    finally:
+        for shm in segments:
+            shm.close()
+            shm.unlink()
+
+
+# --- Main Program ---
+if __name__ == "__main__":
+    n = 200  # Adjust for speed
+    A = [[random.randint(1, 10) for _ in range(n)] for _ in range(n)]
+    B = [[random.randint(1, 10) for _ in range(n)] for _ in range(n)]
+
+    timings = {}
+    for label, fn in [("Single-threaded", matrix_multiply),
+                      ("Multithreaded (1 thread per row)", matrix_multiply_multithreaded),
+                      ("Cache-blocked", matrix_multiply_blocked),
+                      ("NumPy", matrix_multiply_numpy),
+                      (f"Process pool ({os.cpu_count()} workers, shared memory)", matrix_multiply_parallel)]:
+        start = time.perf_counter()
+        C = fn(A, B)
+        timings[label] = time.perf_counter() - start
+        print(f"{label} time: {timings[label]:.4f} sec")
+
+    expected = np.asarray(matrix_multiply_numpy(A, B))
+    assert (np.asarray(C) == expected).all()
+    base = timings["Multithreaded (1 thread per row)"]
+    print("\nSpeedup over the threaded version:")
+    for label, t in timings.items():
+        print(f"  {label}: {base / t:.1f}x")
+
+"""
+Time Complexity: O(n^3) for every variant (the work is split, not reduced)
+Space Complexity: O(n^2)
+"""
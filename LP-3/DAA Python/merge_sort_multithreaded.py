@@ -0,0 +1,250 @@
+"""
+Mini Project 8
+Title: Merge Sort - single-threaded, multithreaded and multi-process
+Aim: To compare recursive (threaded) merge sort with a bounded parallel sort
+that uses every core without creating a thread per recursion level.
+
+  - merge_sort(arr)               -> recursive merge sort (reference)
+  - threaded_merge_sort(arr)      -> two new threads per level (reference)
+  - parallel_merge_sort(data)     -> P chunks sorted by P worker processes in
+                                     shared memory, then a k-way merge into a
+                                     preallocated output array
+  - external_sort(in, out, dtype) -> same pipeline with runs spilled to disk,
+                                     for inputs larger than memory
+
+The k-way merge is heap driven and works block by block: the heap holds
+each run's current block keyed by its largest value. Everything up to the
+smallest such key is final, so it is cut from every run's block with a
+binary search, merged and written out in one vectorised step.
+"""
+
+import heapq
+import os
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+MERGE_BLOCK = 1 << 16                  # elements buffered per run during the merge
+EXTERNAL_MEMORY = 256 << 20            # default memory budget (bytes) for external_sort
+
+
+# --- Reference: recursive merge sort ---
+def merge(left, right):
+    result = []
+    i = j = 0
+    while i < len(left) and j < len(right):
+        if left[i] <= right[j]:
+            result.append(left[i])
+            i += 1
+        else:
+            result.append(right[j])
+            j += 1
+    result += left[i:]
+    result += right[j:]
+    return result
+
+
+def merge_sort(arr):
+    if len(arr) <= 1:
+        return arr
+    mid = len(arr) // 2
+    left = merge_sort(arr[:mid])
+    right = merge_sort(arr[mid:])
+    return merge(left, right)
+
+
+# --- Reference: two threads per recursion level ---
+def threaded_merge_sort(arr):
+    if len(arr) <= 1:
+        return arr
+
+    mid = len(arr) // 2
+    left = []
+    right = []
+
+    def sort_left():
+        nonlocal left
+        left = threaded_merge_sort(arr[:mid])
+
+    def sort_right():
+        nonlocal right
+        right = threaded_merge_sort(arr[mid:])
+
+    t1 = threading.Thread(target=sort_left)
+    t2 = threading.Thread(target=sort_right)
+    t1.start()
+    t2.start()
+    t1.join()
+    t2.join()
+
+    return merge(left, right)
+
+
+# --- k-way merge ---
+def kway_merge(runs, out, block=MERGE_BLOCK):
+    """Merge sorted 1-D runs (arrays or memmaps) into out, block by block.
+
+    Memory use is about (k + 1) * block elements whatever the run lengths.
+    Returns the number of elements written.
+    """
+    runs = [r for r in runs if len(r)]
+    pos = [0] * len(runs)              # next unread index of each run
+    bufs = [None] * len(runs)          # buffered, not yet emitted part of each run
+    heap = []
+
+    def refill(i):
+        start = pos[i]
+        if start < len(runs[i]):
+            bufs[i] = np.asarray(runs[i][start:start + block])
+            pos[i] = start + len(bufs[i])
+            heapq.heappush(heap, (bufs[i][-1], i))
+        else:
+            bufs[i] = None
+
+    for i in range(len(runs)):
+        refill(i)
+
+    written = 0
+    while heap:
+        bound = heap[0][0]             # every value <= bound is now in its final place
+        parts = []
+        for i, buf in enumerate(bufs):
+            if buf is None:
+                continue
+            take = np.searchsorted(buf, bound, side="right")
+            if take:
+                parts.append(buf[:take])
+                bufs[i] = buf[take:]
+        merged = parts[0] if len(parts) == 1 else np.sort(np.concatenate(parts), kind="stable")
+        out[written:written + len(merged)] = merged
+        written += len(merged)
+
+        # Runs whose block ended at or below bound are exhausted: load their next
+        # block, only after popping them all, since a new block may start at bound
+        exhausted = []
+        while heap and heap[0][0] <= bound:
+            exhausted.append(heapq.heappop(heap)[1])
+        for i in exhausted:
+            refill(i)
+    return written
+
+
+# --- Parallel sort over shared memory ---
+_shared = {}                           # per-worker view of the shared input
+
+
+def _init_worker(name, shape, dtype):
+    shm = shared_memory.SharedMemory(name=name)
+    _shared["data"] = (shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf))
+
+
+def _sort_chunk(bounds):
+    start, stop = bounds
+    _shared["data"][1][start:stop].sort(kind="stable")
+    return stop - start
+
+
+def _chunk_bounds(n, parts):
+    size = -(-n // parts)
+    return [(s, min(s + size, n)) for s in range(0, n, size)]
+
+
+def parallel_merge_sort(data, workers=None):
+    """Sorted copy of a 1-D numeric sequence using one chunk per worker process.
+
+    Chunks are sorted in place in a shared-memory buffer (no pickled copies),
+    then combined by kway_merge() into a preallocated output array.
+    """
+    arr = np.asarray(data)
+    if arr.ndim != 1:
+        raise ValueError("parallel_merge_sort expects a 1-D sequence")
+    n = len(arr)
+    workers = workers or os.cpu_count() or 1
+    if n < 2:
+        return arr.copy()
+
+    shm = shared_memory.SharedMemory(create=True, size=arr.nbytes)
+    try:
+        shared = np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)
+        shared[:] = arr
+        bounds = _chunk_bounds(n, workers)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(shm.name, arr.shape, arr.dtype)) as pool:
+            for _ in pool.map(_sort_chunk, bounds):
+                pass
+        out = np.empty_like(arr)
+        kway_merge([shared[s:e] for s, e in bounds], out)
+        return out
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+# --- External (disk-spilling) sort ---
+def _sort_run(task):
+    in_path, dtype, start, count, run_path = task
+    chunk = np.fromfile(in_path, dtype=dtype, count=count, offset=start * np.dtype(dtype).itemsize)
+    chunk.sort(kind="stable")
+    chunk.tofile(run_path)
+    return count
+
+
+def external_sort(in_path, out_path, dtype, memory_limit=EXTERNAL_MEMORY, workers=None, tmp_dir=None):
+    """Sort a raw binary file of `dtype` values into out_path.
+
+    The input is cut into runs small enough that `workers` of them fit in
+    memory_limit together; workers sort one run each and spill it to a
+    temporary file, then the runs are memory-mapped and k-way merged into a
+    memory-mapped output. Returns the number of elements sorted.
+    """
+    dtype = np.dtype(dtype)
+    workers = workers or os.cpu_count() or 1
+    n = os.path.getsize(in_path) // dtype.itemsize
+    run_len = max(1, memory_limit // (dtype.itemsize * workers))
+    if n == 0:
+        open(out_path, "wb").close()
+        return 0
+
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as tmp:
+        tasks = [(in_path, dtype.str, start, min(run_len, n - start), os.path.join(tmp, f"run{i}.bin"))
+                 for i, start in enumerate(range(0, n, run_len))]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for _ in pool.map(_sort_run, tasks):
+                pass
+
+        runs = [np.memmap(t[4], dtype=dtype, mode="r") for t in tasks]
+        out = np.memmap(out_path, dtype=dtype, mode="w+", shape=(n,))
+        # Keep the merge buffers (one per run plus the output) inside the budget
+        block = max(1024, memory_limit // (dtype.itemsize * (len(runs) + 1)))
+        kway_merge(runs, out, block)
+        out.flush()
+        del out, runs
+    return n
+
+
+# --- Main Program ---
+if __name__ == "__main__":
+    data = [random.randint(1, 10000) for _ in range(20000)]
+
+    start = time.perf_counter()
+    expected = merge_sort(data)
+    print(f"Single-threaded time: {time.perf_counter() - start:.4f} sec")
+
+    start = time.perf_counter()
+    threaded_merge_sort(data)
+    print(f"Multithreaded time: {time.perf_counter() - start:.4f} sec")
+
+    start = time.perf_counter()
+    result = parallel_merge_sort(data)
+    print(f"Process-parallel time ({os.cpu_count()} workers): {time.perf_counter() - start:.4f} sec")
+    assert result.tolist() == expected
+
+"""
+Time Complexity: O(n log n) work; about O((n/P) log(n/P) + n log P) with P workers
+Space Complexity: O(n) in memory, O(k * block) for the external merge
+"""
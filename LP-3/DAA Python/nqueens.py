@@ -0,0 +1,221 @@
+"""
+N-Queens solver
+Bitmask backtracking behind 5_n_queens.py. Occupied columns and both
+diagonals are three integers, so finding the free squares of a row is
+one expression instead of rescanning the previous rows:
+    free = full & ~(cols | left_diag | right_diag)
+
+A solution is a tuple `cols` where cols[row] is the column of that row's queen.
+`fixed` is an optional {row: col} mapping of pre-placed queens (0-based);
+every returned solution contains them.
+
+  - first_solution(n, fixed)   -> one solution or None
+  - iter_solutions(n, fixed)   -> generator over all solutions
+  - count_solutions(n, fixed)  -> number of solutions, without building them
+  - count_solutions_parallel(n, fixed, workers) -> same count, split over processes
+
+Without fixed queens the left-right mirror symmetry is used: only queens in
+the left half of the first row are searched and each result is counted (or
+yielded) twice, which halves the work.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Below this size a process pool costs more than it saves
+PARALLEL_MIN_N = 10
+
+
+def _allowed_masks(n, fixed):
+    """Per-row mask of the columns a queen may use, honouring fixed queens."""
+    full = (1 << n) - 1
+    allowed = [full] * n
+    for row, col in (fixed or {}).items():
+        if not (0 <= row < n and 0 <= col < n):
+            raise ValueError(f"fixed queen ({row}, {col}) is off a {n}x{n} board")
+        allowed[row] = 1 << col
+    return allowed
+
+
+# ---------- Search ----------
+def _search(n, allowed, row, cols, ld, rd, path):
+    """Yield every completion of `path` (queens already placed in rows < row)."""
+    if row == n:
+        yield tuple(path)
+        return
+    full = (1 << n) - 1
+    avail = allowed[row] & ~(cols | ld | rd)
+    while avail:
+        bit = avail & -avail
+        avail ^= bit
+        path.append(bit.bit_length() - 1)
+        yield from _search(n, allowed, row + 1, cols | bit, ((ld | bit) << 1) & full, (rd | bit) >> 1, path)
+        path.pop()
+
+
+def _count(n, allowed, row, cols, ld, rd):
+    if row == n:
+        return 1
+    full = (1 << n) - 1
+    total = 0
+    avail = allowed[row] & ~(cols | ld | rd)
+    while avail:
+        bit = avail & -avail
+        avail ^= bit
+        total += _count(n, allowed, row + 1, cols | bit, ((ld | bit) << 1) & full, (rd | bit) >> 1)
+    return total
+
+
+def _count_free(full, cols, ld, rd):
+    """_count() specialised for boards without fixed queens (the hot path)."""
+    if cols == full:
+        return 1
+    total = 0
+    avail = full & ~(cols | ld | rd)
+    while avail:
+        bit = avail & -avail
+        avail ^= bit
+        total += _count_free(full, cols | bit, ((ld | bit) << 1) & full, (rd | bit) >> 1)
+    return total
+
+
+def _place(n, col):
+    """(cols, ld, rd) after putting a queen in row 0, column col."""
+    bit = 1 << col
+    return bit, (bit << 1) & ((1 << n) - 1), bit >> 1
+
+
+# ---------- Public API ----------
+def first_solution(n, fixed=None):
+    """First solution in row-by-row, left-to-right order, or None."""
+    return next(_search(n, _allowed_masks(n, fixed), 0, 0, 0, 0, []), None)
+
+
+def iter_solutions(n, fixed=None):
+    """Generate all solutions.
+
+    With fixed queens the order is lexicographic. Without them, each
+    left-half solution is followed by its mirror image.
+    """
+    if n <= 0:
+        return
+    allowed = _allowed_masks(n, fixed)
+    if fixed or n == 1:
+        yield from _search(n, allowed, 0, 0, 0, 0, [])
+        return
+
+    def mirror(sol):
+        return tuple(n - 1 - c for c in sol)
+
+    half = n // 2
+    for col in range(half):
+        cols, ld, rd = _place(n, col)
+        for sol in _search(n, allowed, 1, cols, ld, rd, [col]):
+            yield sol
+            yield mirror(sol)
+    if n % 2:
+        # Middle column in row 0: mirror the choice made in row 1 instead
+        cols, ld, rd = _place(n, half)
+        row1 = list(allowed)
+        row1[1] = (1 << half) - 1
+        for sol in _search(n, row1, 1, cols, ld, rd, [half]):
+            yield sol
+            yield mirror(sol)
+
+
+def count_solutions(n, fixed=None):
+    """Number of solutions, counted without materialising any board."""
+    if n <= 0:
+        return 0
+    if fixed:
+        return _count(n, _allowed_masks(n, fixed), 0, 0, 0, 0)
+    if n == 1:
+        return 1
+    full = (1 << n) - 1
+    half = n // 2
+    total = 0
+    for col in range(half):
+        total += 2 * _count_free(full, *_place(n, col))
+    if n % 2:
+        cols, ld, rd = _place(n, half)
+        for col in range(half):                     # row 1, left half only
+            bit = 1 << col
+            if bit & (cols | ld | rd):
+                continue
+            total += 2 * _count_free(full, cols | bit, ((ld | bit) << 1) & full, (rd | bit) >> 1)
+    return total
+
+
+def board_rows(solution):
+    """Solution as a list of 0/1 rows, the format the practical prints."""
+    n = len(solution)
+    return [[1 if c == col else 0 for c in range(n)] for col in solution]
+
+
+# ---------- Parallel counting ----------
+def _expand(n, allowed, states, rows):
+    """Extend (weight, row, cols, ld, rd) search states by `rows` more queens."""
+    full = (1 << n) - 1
+    for _ in range(rows):
+        nxt = []
+        for weight, row, cols, ld, rd in states:
+            if row == n:
+                nxt.append((weight, row, cols, ld, rd))
+                continue
+            avail = allowed[row] & ~(cols | ld | rd)
+            while avail:
+                bit = avail & -avail
+                avail ^= bit
+                nxt.append((weight, row + 1, cols | bit, ((ld | bit) << 1) & full, (rd | bit) >> 1))
+        states = nxt
+    return states
+
+
+def split_tasks(n, fixed=None, depth=2):
+    """Independent subtrees covering the whole search: (weight, row, cols, ld, rd).
+
+    Summing weight * (completions of each state) gives count_solutions(n, fixed).
+    The mirror symmetry is applied exactly as in the serial count, which
+    needs at least two rows to be expanded.
+    """
+    allowed = _allowed_masks(n, fixed)
+    if fixed or n == 1:
+        return _expand(n, allowed, [(1, 0, 0, 0, 0)], depth)
+    depth = max(depth, 2)
+    half = n // 2
+    roots = [(2,) + (1,) + _place(n, col) for col in range(half)]
+    states = _expand(n, allowed, roots, depth - 1)
+    if n % 2:
+        row1 = list(allowed)
+        row1[1] = (1 << half) - 1
+        middle = _expand(n, row1, [(2, 1) + _place(n, half)], 1)
+        states += _expand(n, allowed, middle, depth - 2)
+    return states
+
+
+def _count_task(task):
+    n, allowed, row, cols, ld, rd = task
+    if allowed is None:
+        return _count_free((1 << n) - 1, cols, ld, rd)
+    return _count(n, allowed, row, cols, ld, rd)
+
+
+def count_solutions_parallel(n, fixed=None, workers=None, depth=2, chunksize=1):
+    """count_solutions() with the search tree split across a process pool.
+
+    The first `depth` rows are expanded in the parent; each resulting subtree
+    is one task. There are far more tasks than workers and they are handed out
+    `chunksize` at a time, so a worker that finishes early simply picks up
+    the next subtree instead of idling. Results match the serial count.
+    """
+    if n <= 0:
+        return 0
+    if n < PARALLEL_MIN_N or depth < 1:
+        return count_solutions(n, fixed)
+    allowed = tuple(_allowed_masks(n, fixed)) if fixed else None
+    states = split_tasks(n, fixed, depth)
+    tasks = [(n, allowed, row, cols, ld, rd) for _, row, cols, ld, rd in states]
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        counts = pool.map(_count_task, tasks, chunksize=chunksize)
+        return sum(weight * c for (weight, *_), c in zip(states, counts))
@@ -0,0 +1,139 @@
+"""
+Introsort quicksort
+In-place sort behind 6_QuickSort.py, safe on sorted, reversed and
+duplicate-heavy input:
+  - pivot: median of three, or Tukey's ninther on large slices
+  - partition: Dutch national flag (3-way), so runs of equal keys are
+    placed once and never recursed into
+  - explicit stack, larger side pushed, smaller side handled first:
+    at most O(log n) pending slices and no recursion at all
+  - heapsort fallback once a slice exceeds the depth limit (2 * log2 n)
+  - insertion sort for slices of INSERTION_THRESHOLD elements or fewer
+
+Worst case O(n log n), extra space O(log n).
+"""
+
+INSERTION_THRESHOLD = 16
+NINTHER_THRESHOLD = 128
+
+
+# ---------- Small slices ----------
+def insertion_sort(arr, low, high):
+    """Sort arr[low..high] (inclusive) in place."""
+    for i in range(low + 1, high + 1):
+        item = arr[i]
+        j = i - 1
+        while j >= low and item < arr[j]:
+            arr[j + 1] = arr[j]
+            j -= 1
+        arr[j + 1] = item
+
+
+# ---------- Heapsort fallback ----------
+def _sift_down(arr, low, start, end):
+    """Restore the max-heap rooted at start; heap occupies arr[low..end]."""
+    root = start
+    item = arr[root]
+    while True:
+        child = 2 * (root - low) + 1 + low
+        if child > end:
+            break
+        if child < end and arr[child] < arr[child + 1]:
+            child += 1
+        if not item < arr[child]:
+            break
+        arr[root] = arr[child]
+        root = child
+    arr[root] = item
+
+
+def heap_sort(arr, low, high):
+    """Sort arr[low..high] (inclusive) in place, O(n log n) guaranteed."""
+    for start in range((low + high - 1) // 2, low - 1, -1):
+        _sift_down(arr, low, start, high)
+    for end in range(high, low, -1):
+        arr[low], arr[end] = arr[end], arr[low]
+        _sift_down(arr, low, low, end - 1)
+
+
+# ---------- Pivot selection ----------
+def _median3(arr, a, b, c):
+    """Index of the median of arr[a], arr[b], arr[c]."""
+    x, y, z = arr[a], arr[b], arr[c]
+    if x < y:
+        if y < z:
+            return b
+        return c if x < z else a
+    if x < z:
+        return a
+    return c if y < z else b
+
+
+def choose_pivot(arr, low, high):
+    """Median of three for small slices, ninther (median of medians of three) for large ones."""
+    mid = (low + high) // 2
+    if high - low + 1 < NINTHER_THRESHOLD:
+        return _median3(arr, low, mid, high)
+    step = (high - low) // 8
+    return _median3(arr,
+                    _median3(arr, low, low + step, low + 2 * step),
+                    _median3(arr, mid - step, mid, mid + step),
+                    _median3(arr, high - 2 * step, high - step, high))
+
+
+# ---------- 3-way partition ----------
+def partition3(arr, low, high, pivot_index):
+    """Dutch-flag partition of arr[low..high] around arr[pivot_index].
+
+    Returns (lt, gt): afterwards arr[low..lt-1] < pivot, arr[lt..gt] == pivot
+    and arr[gt+1..high] > pivot.
+    """
+    pivot = arr[pivot_index]
+    lt, i, gt = low, low, high
+    while i <= gt:
+        item = arr[i]
+        if item < pivot:
+            arr[lt], arr[i] = item, arr[lt]
+            lt += 1
+            i += 1
+        elif pivot < item:
+            arr[gt], arr[i] = item, arr[gt]
+            gt -= 1
+        else:
+            i += 1
+    return lt, gt
+
+
+# ---------- Introsort ----------
+def introsort(arr, low=0, high=None):
+    """Sort arr[low..high] (inclusive, default whole list) in place."""
+    if high is None:
+        high = len(arr) - 1
+    if high <= low:
+        return arr
+    depth_limit = 2 * (high - low + 1).bit_length()
+    stack = [(low, high, depth_limit)]
+    while stack:
+        low, high, depth = stack.pop()
+        while high - low + 1 > INSERTION_THRESHOLD:
+            if depth == 0:
+                heap_sort(arr, low, high)
+                break
+            depth -= 1
+            lt, gt = partition3(arr, low, high, choose_pivot(arr, low, high))
+            # Defer the larger side, keep looping on the smaller one
+            if lt - low < high - gt:
+                stack.append((gt + 1, high, depth))
+                high = lt - 1
+            else:
+                stack.append((low, lt - 1, depth))
+                low = gt + 1
+        else:
+            if low < high:
+                insertion_sort(arr, low, high)
+    return arr
+
+
+def sort(arr):
+    """Sort a list in place with introsort and return it."""
+    return introsort(arr, 0, len(arr) - 1)
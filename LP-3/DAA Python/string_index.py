@@ -0,0 +1,265 @@
+"""
+String indexes for Mini Project 9
+Two companions to naive_search() in string_matching_algorithms.py for
+workloads where it rescans the same text over and over:
+
+  - AhoCorasick(patterns)      -> compiled automaton; one pass over the text
+                                  reports every occurrence of every pattern
+  - SuffixArrayIndex.build(t)  -> suffix array + LCP array over a corpus,
+                                  built once; find(p) answers in O(m log n)
+  - index.save(dir) / SuffixArrayIndex.load(dir)
+                               -> arrays stored as .npy files and
+                                  memory-mapped back in, not re-read
+"""
+
+import os
+import time
+from collections import deque
+
+import numpy as np
+
+
+def _as_bytes(data):
+    if isinstance(data, str):
+        return data.encode("utf-8")
+    return data
+
+
+# --- Aho-Corasick automaton ---
+class AhoCorasick:
+    """Byte-level Aho-Corasick automaton compiled to a dense transition table.
+
+    goto[state][byte] already includes the failure transitions, so scanning
+    costs one list lookup per input byte whatever the number of patterns.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = list(dict.fromkeys(_as_bytes(p) for p in patterns))
+        if any(len(p) == 0 for p in self.patterns):
+            raise ValueError("patterns must be non-empty")
+
+        # Trie
+        children = [{}]
+        outputs = [[]]
+        for pid, pattern in enumerate(self.patterns):
+            state = 0
+            for byte in pattern:
+                nxt = children[state].get(byte)
+                if nxt is None:
+                    nxt = len(children)
+                    children[state][byte] = nxt
+                    children.append({})
+                    outputs.append([])
+                state = nxt
+            outputs[state].append(pid)
+
+        # Breadth-first: failure links, then fill every missing edge from the fail state
+        goto = [None] * len(children)
+        fail = [0] * len(children)
+        goto[0] = [children[0].get(b, 0) for b in range(256)]
+        queue = deque(children[0].values())
+        while queue:
+            state = queue.popleft()
+            f = fail[state]
+            outputs[state] = outputs[state] + outputs[f]
+            row = list(goto[f])
+            for byte, child in children[state].items():
+                fail[child] = goto[f][byte]
+                row[byte] = child
+                queue.append(child)
+            goto[state] = row
+
+        self.goto = goto
+        self.outputs = [tuple(out) for out in outputs]
+        self.lengths = [len(p) for p in self.patterns]
+
+    def iter_matches(self, data, offset=0):
+        """Yield (start position, pattern) for every occurrence, in order of end position."""
+        goto, outputs, lengths, patterns = self.goto, self.outputs, self.lengths, self.patterns
+        state = 0
+        for i, byte in enumerate(_as_bytes(data)):
+            state = goto[state][byte]
+            if outputs[state]:
+                for pid in outputs[state]:
+                    yield offset + i - lengths[pid] + 1, patterns[pid]
+
+    def search(self, data):
+        """{pattern: [positions]} for every pattern."""
+        found = {p: [] for p in self.patterns}
+        for pos, p in self.iter_matches(data):
+            found[p].append(pos)
+        return found
+
+    def search_stream(self, fileobj, chunk_size=1 << 20):
+        """search() over a binary file object; the automaton state carries across chunks."""
+        goto, outputs, lengths, patterns = self.goto, self.outputs, self.lengths, self.patterns
+        found = {p: [] for p in patterns}
+        state = 0
+        offset = 0
+        while True:
+            chunk = fileobj.read(chunk_size)
+            if not chunk:
+                return found
+            for i, byte in enumerate(chunk):
+                state = goto[state][byte]
+                if outputs[state]:
+                    for pid in outputs[state]:
+                        found[patterns[pid]].append(offset + i - lengths[pid] + 1)
+            offset += len(chunk)
+
+
+# --- Suffix array + LCP ---
+def suffix_array(text):
+    """Suffix array of a bytes-like text by prefix doubling, vectorised with NumPy.
+
+    Each round sorts suffixes by (rank of first k bytes, rank of next k bytes)
+    with np.lexsort, so there are at most log2(n) O(n log n) rounds.
+    """
+    arr = np.frombuffer(_as_bytes(text), dtype=np.uint8)
+    n = len(arr)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    rank = arr.astype(np.int64)
+    k = 1
+    while True:
+        second = np.full(n, -1, dtype=np.int64)
+        second[:n - k] = rank[k:]
+        sa = np.lexsort((second, rank))
+        first_sorted, second_sorted = rank[sa], second[sa]
+        new_group = (first_sorted[1:] != first_sorted[:-1]) | (second_sorted[1:] != second_sorted[:-1])
+        rank = np.empty(n, dtype=np.int64)
+        rank[sa] = np.concatenate(([0], np.cumsum(new_group)))
+        if rank[sa[-1]] == n - 1 or k >= n:
+            return sa.astype(np.int64)
+        k *= 2
+
+
+def lcp_array(text, sa):
+    """Kasai's algorithm: lcp[i] = common prefix length of suffixes sa[i-1] and sa[i] (lcp[0] = 0)."""
+    text = _as_bytes(text)
+    n = len(sa)
+    rank = [0] * n
+    sa_list = sa.tolist()
+    for i, s in enumerate(sa_list):
+        rank[s] = i
+    lcp = [0] * n
+    h = 0
+    for i in range(n):
+        r = rank[i]
+        if r == 0:
+            h = 0
+            continue
+        j = sa_list[r - 1]
+        while i + h < n and j + h < n and text[i + h] == text[j + h]:
+            h += 1
+        lcp[r] = h
+        if h:
+            h -= 1
+    return np.array(lcp, dtype=np.int64)
+
+
+class SuffixArrayIndex:
+    """Build-once index answering "all occurrences of p" in O(m log n + occ)."""
+
+    def __init__(self, text, sa, lcp):
+        self.text = text               # bytes or uint8 memmap
+        self.sa = sa
+        self.lcp = lcp
+
+    @classmethod
+    def build(cls, text):
+        text = bytes(_as_bytes(text))
+        sa = suffix_array(text)
+        return cls(text, sa, lcp_array(text, sa))
+
+    def _suffix_prefix(self, i, m):
+        start = int(self.sa[i])
+        return bytes(self.text[start:start + m])
+
+    def _bounds(self, pattern):
+        """[lo, hi) range of suffix-array rows that start with pattern."""
+        m = len(pattern)
+        lo, hi = 0, len(self.sa)
+        while lo < hi:                 # first row >= pattern
+            mid = (lo + hi) // 2
+            if self._suffix_prefix(mid, m) < pattern:
+                lo = mid + 1
+            else:
+                hi = mid
+        first = lo
+        hi = len(self.sa)
+        while lo < hi:                 # first row whose m-prefix > pattern
+            mid = (lo + hi) // 2
+            if self._suffix_prefix(mid, m) <= pattern:
+                lo = mid + 1
+            else:
+                hi = mid
+        return first, lo
+
+    def count(self, pattern):
+        lo, hi = self._bounds(_as_bytes(pattern))
+        return hi - lo
+
+    def find(self, pattern):
+        """Sorted start positions of every occurrence of pattern."""
+        pattern = _as_bytes(pattern)
+        if not pattern:
+            raise ValueError("pattern must be non-empty")
+        lo, hi = self._bounds(pattern)
+        return np.sort(np.asarray(self.sa[lo:hi])).tolist()
+
+    def longest_repeat(self):
+        """Longest substring occurring at least twice, read off the LCP array."""
+        if len(self.lcp) == 0:
+            return b""
+        i = int(np.argmax(self.lcp))
+        return self._suffix_prefix(i, int(self.lcp[i]))
+
+    # Serialisation
+    def save(self, directory):
+        """Write text.npy, sa.npy and lcp.npy into directory."""
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, "text.npy"), np.frombuffer(bytes(self.text), dtype=np.uint8))
+        np.save(os.path.join(directory, "sa.npy"), np.asarray(self.sa))
+        np.save(os.path.join(directory, "lcp.npy"), np.asarray(self.lcp))
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """Open an index written by save(); arrays are memory-mapped unless mmap=False."""
+        mode = "r" if mmap else None
+        text = np.load(os.path.join(directory, "text.npy"), mmap_mode=mode)
+        sa = np.load(os.path.join(directory, "sa.npy"), mmap_mode=mode)
+        lcp = np.load(os.path.join(directory, "lcp.npy"), mmap_mode=mode)
+        return cls(text, sa, lcp)
+
+
+# --- Main Program ---
+if __name__ == "__main__":
+    from string_matching_algorithms import naive_search
+
+    text = "ABCD" * 10000
+    patterns = ["BCDA", "CDAB", "DDD"]
+
+    start = time.perf_counter()
+    naive = {p: naive_search(text, p) for p in patterns}
+    print(f"Naive Search Time ({len(patterns)} patterns): {time.perf_counter() - start:.4f} sec")
+
+    start = time.perf_counter()
+    ac = AhoCorasick(patterns).search(text)
+    print(f"Aho-Corasick Time (one pass): {time.perf_counter() - start:.4f} sec")
+
+    start = time.perf_counter()
+    index = SuffixArrayIndex.build(text)
+    print(f"Suffix Array Build Time: {time.perf_counter() - start:.4f} sec")
+    start = time.perf_counter()
+    sa = {p: index.find(p) for p in patterns}
+    print(f"Suffix Array Query Time: {time.perf_counter() - start:.4f} sec")
+
+    assert naive == {p.decode(): v for p, v in ac.items()} == sa
+    print("Matches Found:", {p: len(v) for p, v in naive.items()})
+
+"""
+Time Complexity:
+Aho-Corasick - O(total pattern length * 256) to build, O(n + matches) to scan
+Suffix Array - O(n log^2 n) to build, O(m log n + occ) per query
+"""
@@ -0,0 +1,277 @@
+"""
+Mini Project 9
+Title: Naive and Rabin-Karp String Matching
+Aim: To compare the naive scan with a Rabin-Karp search that stays fast on
+large inputs and many patterns.
+
+  - naive_search(text, pattern)      -> O(n*m) reference
+  - rabin_karp(text, pattern)        -> textbook version, prime=101 (reference)
+  - PatternSet(patterns)             -> compiled multi-pattern Rabin-Karp:
+        .search(data)                -> {pattern: [positions]} over bytes/memoryview
+        .search_stream(fileobj)      -> same, reading the file in overlapping chunks
+  - search_file(path, patterns)      -> convenience wrapper around search_stream
+
+Repeated queries against one corpus are better served by string_index.py
+(Aho-Corasick automaton, suffix array + LCP index).
+
+The fast path hashes every window of the text at once with NumPy, using two
+independent moduli close to 2^31 (double hashing, about 62 bits of hash),
+so a false hash match is astronomically rare. The rolling recurrence is
+replaced by prefix sums:
+    hash(text[i:i+m]) = (S[i+m] - S[i]) * B^-i  (mod p),  S[k] = sum text[j] * B^j
+Patterns are grouped by length. For each length, every window hash is first
+checked against a bitmap indexed by its low bits, then the survivors are
+looked up in that length's sorted set of pattern hashes, and the few hits
+are confirmed with a direct byte comparison, so reported positions are
+always exact.
+"""
+
+import random
+import time
+
+import numpy as np
+
+MOD1 = 2147483647                      # 2^31 - 1 (Mersenne prime)
+MOD2 = 2147483629                      # largest prime below 2^31 - 1
+CHUNK_SIZE = 1 << 22                   # bytes per step in search_stream()
+FILTER_BITS = 20                       # size (2^bits) of the per-length direct-address filter
+
+
+# --- Naive String Matching ---
+def naive_search(text, pattern):
+    n = len(text)
+    m = len(pattern)
+    positions = []
+    for i in range(n - m + 1):
+        if text[i:i + m] == pattern:
+            positions.append(i)
+    return positions
+
+
+# --- Rabin-Karp String Matching (textbook) ---
+def rabin_karp(text, pattern, base=256, prime=101):
+    n = len(text)
+    m = len(pattern)
+    positions = []
+
+    pat_hash = 0
+    txt_hash = 0
+    h = 1
+
+    for i in range(m - 1):
+        h = (h * base) % prime
+
+    for i in range(m):
+        pat_hash = (base * pat_hash + ord(pattern[i])) % prime
+        txt_hash = (base * txt_hash + ord(text[i])) % prime
+
+    for i in range(n - m + 1):
+        if pat_hash == txt_hash:
+            if text[i:i + m] == pattern:
+                positions.append(i)
+        if i < n - m:
+            txt_hash = (base * (txt_hash - ord(text[i]) * h) + ord(text[i + m])) % prime
+            txt_hash = (txt_hash + prime) % prime
+
+    return positions
+
+
+# --- Vectorised multi-pattern Rabin-Karp ---
+def _as_bytes(data):
+    if isinstance(data, str):
+        return data.encode("utf-8")
+    return data
+
+
+def _powers(base, count, mod):
+    """[base^0, base^1, ..., base^(count-1)] mod `mod` as uint64, by doubling."""
+    pw = np.empty(max(count, 1), dtype=np.uint64)
+    pw[0] = 1
+    filled = 1
+    while filled < count:
+        step = min(filled, count - filled)
+        pw[filled:filled + step] = pw[:step] * np.uint64(pow(base, filled, mod)) % np.uint64(mod)
+        filled += step
+    return pw[:count]
+
+
+class _Modulus:
+    """Power tables for one modulus, grown on demand."""
+
+    def __init__(self, mod, base):
+        self.mod = mod
+        self.base = base
+        self.pw = _powers(base, 0, mod)
+        self.ipw = self.pw
+
+    def ensure(self, count):
+        if len(self.pw) < count:
+            self.pw = _powers(self.base, count, self.mod)
+            self.ipw = _powers(pow(self.base, -1, self.mod), count, self.mod)
+
+    def pattern_hash(self, pattern):
+        h = 0
+        for t, byte in enumerate(pattern):
+            h = (h + byte * pow(self.base, t, self.mod)) % self.mod
+        return h
+
+    def prefix(self, arr):
+        """S[k] = sum(arr[j] * base^j for j < k) mod p, length len(arr) + 1."""
+        mod = np.uint64(self.mod)
+        terms = arr * self.pw[:len(arr)] % mod
+        prefix = np.zeros(len(arr) + 1, dtype=np.uint64)
+        np.cumsum(terms, out=prefix[1:])       # < n * 2^31, no overflow below 2^32 bytes
+        prefix %= mod
+        return prefix
+
+    def windows(self, prefix, m):
+        """Normalised hash of every length-m window, given prefix()."""
+        mod = np.uint64(self.mod)
+        count = len(prefix) - m
+        diff = (prefix[m:] + mod - prefix[:count]) % mod
+        return diff * self.ipw[:count] % mod
+
+    def windows_at(self, prefix, m, positions):
+        """windows(prefix, m) evaluated only at the given start positions."""
+        mod = np.uint64(self.mod)
+        diff = (prefix[positions + m] + mod - prefix[positions]) % mod
+        return diff * self.ipw[positions] % mod
+
+
+class PatternSet:
+    """Compiled set of byte patterns for repeated multi-pattern searches."""
+
+    def __init__(self, patterns, seed=None):
+        patterns = [_as_bytes(p) for p in patterns]
+        if any(len(p) == 0 for p in patterns):
+            raise ValueError("patterns must be non-empty")
+        rng = random.Random(seed)
+        # A random base per PatternSet keeps adversarial inputs from forcing collisions
+        self.mods = (_Modulus(MOD1, rng.randrange(256, MOD1 - 1)),
+                     _Modulus(MOD2, rng.randrange(256, MOD2 - 1)))
+        self.patterns = list(dict.fromkeys(patterns))
+        self.max_length = max((len(p) for p in self.patterns), default=0)
+
+        # length -> (sorted array of combined keys, filter on the second hash's low bits,
+        #            {key: [patterns]})
+        self.groups = {}
+        for p in self.patterns:
+            key = self._combine(*(mod.pattern_hash(p) for mod in self.mods))
+            keys, by_key = self.groups.setdefault(len(p), ([], {}))
+            if key not in by_key:
+                keys.append(key)
+            by_key.setdefault(key, []).append(p)
+        mask = np.uint64((1 << FILTER_BITS) - 1)
+        compiled = {}
+        for m, (keys, by_key) in self.groups.items():
+            keys = np.array(sorted(keys), dtype=np.uint64)
+            bitmap = np.zeros(1 << FILTER_BITS, dtype=bool)
+            bitmap[keys & mask] = True
+            compiled[m] = (keys, bitmap, by_key)
+        self.groups = compiled
+
+    @staticmethod
+    def _combine(h1, h2):
+        return (h1 << 31) | h2
+
+    def _matches(self, data, min_end=0):
+        """Yield (position, pattern) for matches in data ending after min_end."""
+        n = len(data)
+        if n == 0 or not self.patterns:
+            return
+        arr = np.frombuffer(data, dtype=np.uint8).astype(np.uint64)
+        for mod in self.mods:
+            mod.ensure(n)
+        prefixes = [mod.prefix(arr) for mod in self.mods]
+        view = memoryview(data)
+        mask = np.uint64((1 << FILTER_BITS) - 1)
+        for m, (keys, bitmap, by_key) in self.groups.items():
+            if m > n:
+                continue
+            # Filter on the second hash for every window, then hash the survivors again
+            h2 = self.mods[1].windows(prefixes[1], m)
+            candidates = np.flatnonzero(bitmap[h2 & mask])
+            h1 = self.mods[0].windows_at(prefixes[0], m, candidates)
+            cand_keys = (h1 << np.uint64(31)) | h2[candidates]
+            idx = np.minimum(np.searchsorted(keys, cand_keys), len(keys) - 1)
+            hit = keys[idx] == cand_keys
+            hits, hit_keys = candidates[hit], cand_keys[hit]
+            start = np.searchsorted(hits, max(0, min_end - m + 1))
+            for pos, key in zip(hits[start:].tolist(), hit_keys[start:].tolist()):
+                for p in by_key[key]:
+                    if view[pos:pos + m] == p:      # confirm: no false positives
+                        yield pos, p
+
+    def search(self, data):
+        """All occurrences in a bytes-like object: {pattern: [positions]}."""
+        found = {p: [] for p in self.patterns}
+        for pos, p in self._matches(_as_bytes(data)):
+            found[p].append(pos)
+        for positions in found.values():
+            positions.sort()
+        return found
+
+    def search_stream(self, fileobj, chunk_size=CHUNK_SIZE):
+        """search() over a binary file object, read chunk by chunk.
+
+        The last max_length - 1 bytes of each chunk are carried into the next
+        one so matches crossing a chunk boundary are found; a match is reported
+        by the chunk in which it ends, so none is reported twice.
+        """
+        found = {p: [] for p in self.patterns}
+        overlap = max(self.max_length - 1, 0)
+        tail = b""
+        offset = 0                     # file position of tail[0]
+        while True:
+            chunk = fileobj.read(chunk_size)
+            if not chunk:
+                break
+            buf = tail + chunk
+            for pos, p in self._matches(buf, min_end=len(tail)):
+                found[p].append(offset + pos)
+            keep = min(overlap, len(buf))
+            offset += len(buf) - keep
+            tail = buf[len(buf) - keep:]
+        for positions in found.values():
+            positions.sort()
+        return found
+
+
+def rabin_karp_search(text, pattern):
+    """Positions of one pattern, using the vectorised double-hash search."""
+    pattern = _as_bytes(pattern)
+    return PatternSet([pattern]).search(text)[pattern]
+
+
+def search_file(path, patterns, chunk_size=CHUNK_SIZE):
+    """{pattern: [byte offsets]} for every pattern in the file at path."""
+    with open(path, "rb") as f:
+        return PatternSet(patterns).search_stream(f, chunk_size)
+
+
+# --- Main Program ---
+if __name__ == "__main__":
+    text = "ABCD" * 10000
+    pattern = "BCDA"
+
+    start = time.perf_counter()
+    naive_result = naive_search(text, pattern)
+    print(f"Naive Search Time: {time.perf_counter() - start:.4f} sec")
+
+    start = time.perf_counter()
+    rabin_result = rabin_karp(text, pattern)
+    print(f"Rabin-Karp Time: {time.perf_counter() - start:.4f} sec")
+
+    start = time.perf_counter()
+    fast_result = rabin_karp_search(text, pattern)
+    print(f"Rabin-Karp (vectorised, double hash) Time: {time.perf_counter() - start:.4f} sec")
+
+    assert naive_result == rabin_result == fast_result
+    print(f"Matches Found: {len(rabin_result)}")
+
+"""
+Time Complexity:
+Naive - O(n*m)
+Rabin-Karp - Average O(n + m)
+PatternSet - O(n * L) for L distinct pattern lengths, independent of the pattern count
+"""
@@ -0,0 +1,558 @@
+"""
+Mini Project 10
+Title: Implement exact and approximation algorithms for Travelling Salesperson Problem (TSP)
+Aim: To observe difference in performance between brute-force and heuristic approach
+
+  - tsp_bruteforce(distance)       -> every permutation, O(n! * n) (reference)
+  - tsp_nearest_neighbor(distance) -> greedy tour, O(n^2) (reference)
+  - held_karp(distance)            -> exact bitmask DP, O(2^n * n^2) time,
+                                      O(2^n * n) memory; practical to ~24 cities
+  - tsp_branch_bound(distance)     -> exact depth-first branch and bound with
+                                      degree and spanning-tree lower bounds, optional
+                                      node and time limits
+
+Heuristics for large instances work on coordinates and never build the
+distance matrix:
+
+  - candidate_lists(coords)        -> k nearest neighbours per city (KD-tree)
+  - nearest_neighbor_tour(coords)  -> greedy tour, candidate list first, then
+                                      a masked NumPy argmin over unvisited cities
+  - local_search(coords, tour)     -> 2-opt + Or-opt restricted to candidate
+                                      neighbours, with don't-look bits and an
+                                      optional time budget
+  - tsp_heuristic(coords)          -> the two combined
+
+All solvers take a square distance matrix (list of lists or NumPy array,
+asymmetric allowed) and return tours that start and end at city 0.
+
+Held-Karp: dp[S, j] is the cheapest path that leaves city 0, visits exactly
+the cities in bitmask S (over cities 1..n-1) and ends at j. Subsets are
+processed one popcount layer at a time, and within a layer every subset
+containing j is updated at once with NumPy:
+    dp[S, j] = min_k dp[S - {j}, k] + d(k, j)
+No parent table is kept; the tour is rebuilt by re-running that minimum
+backwards from the full set.
+"""
+
+import itertools
+import math
+import random
+import time
+from collections import deque, namedtuple
+
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:                    # candidate_lists() falls back to brute force
+    cKDTree = None
+
+HELD_KARP_MAX_CITIES = 24              # 2^23 * 23 int32 cells, about 0.8 GB
+_INT_INF = 1 << 30                     # "unreachable" in the int32 DP table
+CANDIDATES = 10                        # neighbour-list length for the coordinate heuristics
+EPSILON = 1e-9                         # minimum gain for a local-search move
+
+TourResult = namedtuple("TourResult", "cost tour optimal nodes elapsed")
+HeuristicResult = namedtuple("HeuristicResult", "cost tour moves elapsed")
+
+
+# --- Exact Solution: Brute Force (reference) ---
+def tsp_bruteforce(distance):
+    n = len(distance)
+    vertices = range(n)
+    min_cost = math.inf
+    best_path = []
+
+    for perm in itertools.permutations(vertices[1:]):
+        path = [0] + list(perm) + [0]
+        cost = sum(distance[path[i]][path[i + 1]] for i in range(len(path) - 1))
+        if cost < min_cost:
+            min_cost = cost
+            best_path = path
+    return min_cost, best_path
+
+
+# --- Approximation: Nearest Neighbor (reference) ---
+def tsp_nearest_neighbor(distance):
+    n = len(distance)
+    visited = [False] * n
+    path = [0]
+    visited[0] = True
+    cost = 0
+
+    for _ in range(n - 1):
+        last = path[-1]
+        next_city = min([(i, distance[last][i]) for i in range(n) if not visited[i]], key=lambda x: x[1])[0]
+        path.append(next_city)
+        visited[next_city] = True
+        cost += distance[last][next_city]
+
+    cost += distance[path[-1]][0]  # return to start
+    path.append(0)
+    return cost, path
+
+
+# --- Helpers ---
+def _as_matrix(distance):
+    D = np.asarray(distance)
+    if D.ndim != 2 or D.shape[0] != D.shape[1]:
+        raise ValueError(f"distance must be a square matrix, got shape {D.shape}")
+    return D
+
+
+def tour_cost(distance, tour):
+    """Length of a closed tour given as [c0, c1, ..., c0]."""
+    D = _as_matrix(distance)
+    tour = np.asarray(tour)
+    return D[tour[:-1], tour[1:]].sum().item()
+
+
+def _dp_dtype(D):
+    """int32 for small non-negative integer distances (half the memory), else float64."""
+    n = len(D)
+    if np.issubdtype(D.dtype, np.integer) and D.min() >= 0 and int(D.max()) * n < _INT_INF // 2:
+        return np.int32, _INT_INF
+    return np.float64, np.inf
+
+
+# --- Exact Solution: Held-Karp ---
+def held_karp(distance):
+    """Optimal (cost, tour) by dynamic programming over subsets."""
+    D = _as_matrix(distance)
+    n = len(D)
+    if n <= 1:
+        return 0, [0] * (n + 1)
+    if n > HELD_KARP_MAX_CITIES:
+        raise ValueError(f"held_karp supports at most {HELD_KARP_MAX_CITIES} cities; "
+                         "use tsp_branch_bound for larger instances")
+
+    m = n - 1                              # cities 1..n-1 map to bits 0..m-1
+    size = 1 << m
+    dtype, inf = _dp_dtype(D)
+    W = D[1:, 1:].astype(dtype)            # W[k, j] = d(k+1, j+1)
+
+    dp = np.full((size, m), inf, dtype=dtype)
+    singles = 1 << np.arange(m)
+    dp[singles, np.arange(m)] = D[0, 1:]
+
+    all_masks = np.arange(size)
+    popcount = np.zeros(size, dtype=np.uint8)
+    for b in range(m):
+        popcount += ((all_masks >> b) & 1).astype(np.uint8)
+
+    for layer in range(2, m + 1):
+        masks = np.flatnonzero(popcount == layer)
+        for j in range(m):
+            with_j = masks[(masks >> j) & 1 == 1]
+            # dp of cities outside the previous set is inf, so they never win the min
+            dp[with_j, j] = (dp[with_j ^ (1 << j)] + W[:, j]).min(axis=1)
+
+    full = size - 1
+    closing = dp[full] + D[1:, 0].astype(dtype)
+    j = int(np.argmin(closing))
+    cost = closing[j].item()
+
+    # Walk back: the predecessor of j in set S is the k attaining dp[S, j]
+    order = [j]
+    mask = full
+    while mask != 1 << j:
+        mask ^= 1 << j
+        j = int(np.argmin(dp[mask] + W[:, j]))
+        order.append(j)
+    return cost, [0] + [c + 1 for c in reversed(order)] + [0]
+
+
+# --- Exact Solution: Branch and Bound ---
+def _mst_weight(S, nodes):
+    """Weight of a minimum spanning tree over `nodes` (Prim on the dense submatrix)."""
+    sub = S[np.ix_(nodes, nodes)]
+    best = sub[0].copy()
+    done = np.zeros(len(nodes), dtype=bool)
+    done[0] = True
+    best[0] = np.inf
+    total = 0.0
+    for _ in range(len(nodes) - 1):
+        j = int(np.argmin(best))
+        total += best[j]
+        done[j] = True
+        np.minimum(best, sub[j], out=best)
+        best[done] = np.inf
+    return total
+
+
+def _lower_bound(Dm, S, current, remaining):
+    """Lower bound on completing a path at `current` through `remaining` back to 0.
+
+    Every remaining city and `current` still need one outgoing edge, and every
+    remaining city and 0 one incoming edge; the cheapest admissible edge of
+    each gives two bounds. The rest of the path is also a spanning tree of
+    {current, 0} + remaining, so its minimum spanning tree under S (the
+    elementwise min of D and D.T) is a third. The largest is returned. Dm and
+    S have inf on their diagonals.
+    """
+    targets = np.append(remaining, 0)
+    out_bound = Dm[current, remaining].min() + Dm[np.ix_(remaining, targets)].min(axis=1).sum()
+    sources = np.append(remaining, current)
+    in_bound = Dm[remaining, 0].min() + Dm[np.ix_(sources, remaining)].min(axis=0).sum()
+    tree_bound = _mst_weight(S, np.append(sources, 0))
+    return max(out_bound, in_bound, tree_bound)
+
+
+def tsp_branch_bound(distance, initial_tour=None, max_nodes=None, time_limit=None):
+    """Depth-first branch and bound; returns TourResult(cost, tour, optimal, nodes, elapsed).
+
+    Children are tried nearest first and pruned when cost + _lower_bound()
+    cannot beat the incumbent, which starts as initial_tour or the
+    nearest-neighbour tour. max_nodes / time_limit (seconds) cap the search;
+    the best tour found so far is returned with optimal=False.
+    """
+    start_time = time.perf_counter()
+    D = _as_matrix(distance)
+    n = len(D)
+    if n <= 2:
+        tour = list(range(n)) + [0] if n else [0]
+        return TourResult(tour_cost(D, tour) if n else 0, tour, True, 0, 0.0)
+
+    Dm = D.astype(np.float64)
+    np.fill_diagonal(Dm, np.inf)
+    S = np.minimum(Dm, Dm.T)
+    best_tour = list(initial_tour) if initial_tour is not None else tsp_nearest_neighbor(D.tolist())[1]
+    best_cost = tour_cost(D, best_tour)
+    neighbours = [sorted(range(1, n), key=lambda j, i=i: Dm[i, j]) for i in range(n)]
+
+    nodes = 0
+    optimal = True
+    path = [0]
+    visited = [False] * n
+    visited[0] = True
+
+    def search(current, cost):
+        nonlocal best_cost, best_tour, nodes, optimal
+        if (max_nodes is not None and nodes >= max_nodes) or \
+           (time_limit is not None and time.perf_counter() - start_time >= time_limit):
+            optimal = False
+            return
+        nodes += 1
+        if len(path) == n:
+            total = cost + Dm[current, 0]
+            if total < best_cost:
+                best_cost, best_tour = total, path + [0]
+            return
+        remaining = np.array([c for c in range(1, n) if not visited[c]])
+        if cost + _lower_bound(Dm, S, current, remaining) >= best_cost:
+            return
+        for nxt in neighbours[current]:
+            if visited[nxt]:
+                continue
+            step = cost + Dm[current, nxt]
+            if step >= best_cost:
+                break                          # neighbours are sorted: the rest are no better
+            visited[nxt] = True
+            path.append(nxt)
+            search(nxt, step)
+            path.pop()
+            visited[nxt] = False
+            if not optimal:
+                return
+
+    search(0, 0.0)
+    return TourResult(tour_cost(D, best_tour), best_tour, optimal, nodes, time.perf_counter() - start_time)
+
+
+# --- Heuristics on coordinates ---
+def candidate_lists(coords, k=CANDIDATES):
+    """(n, k) array: the k nearest other cities of every city, nearest first.
+
+    Uses a KD-tree when SciPy is available, else chunked brute force in NumPy.
+    """
+    pts = np.asarray(coords, dtype=np.float64)
+    n = len(pts)
+    k = min(k, n - 1)
+    if k <= 0:
+        return np.zeros((n, 0), dtype=np.int64)
+    if cKDTree is not None:
+        _, idx = cKDTree(pts).query(pts, k=k + 1)
+        idx = np.asarray(idx, dtype=np.int64).reshape(n, k + 1)
+    else:
+        idx = np.empty((n, k + 1), dtype=np.int64)
+        step = max(1, (1 << 22) // n)          # keep each distance block near 32 MB
+        for s in range(0, n, step):
+            block = ((pts[s:s + step, None, :] - pts[None, :, :]) ** 2).sum(axis=2)
+            part = np.argpartition(block, k, axis=1)[:, :k + 1]
+            order = np.argsort(np.take_along_axis(block, part, axis=1), axis=1, kind="stable")
+            idx[s:s + step] = np.take_along_axis(part, order, axis=1)
+    # Drop each city from its own list (usually, but with duplicates not always, column 0)
+    own = idx == np.arange(n)[:, None]
+    own[~own.any(axis=1), -1] = True
+    return idx[~own].reshape(n, k)
+
+
+def nearest_neighbor_tour(coords, neighbours=None, start=0):
+    """Greedy nearest-neighbour tour [start, ..., start] over coordinates.
+
+    The nearest unvisited city is the first unvisited entry of the city's
+    candidate list when there is one. Otherwise it comes from a KD-tree over
+    the remaining cities, queried for more and more neighbours, or as a last
+    resort a masked NumPy argmin over them. The remaining set (and its tree)
+    is rebuilt each time half of it has been visited.
+    """
+    pts = np.asarray(coords, dtype=np.float64)
+    n = len(pts)
+    if n == 0:
+        return []
+    if neighbours is None:
+        neighbours = candidate_lists(pts)
+    neighbours = neighbours.tolist()
+    visited = np.zeros(n, dtype=bool)
+    remaining = np.arange(n)
+    tree = None
+    tour = [start]
+    visited[start] = True
+    current = start
+    for step in range(1, n):
+        nxt = -1
+        for c in neighbours[current]:
+            if not visited[c]:
+                nxt = c
+                break
+        if nxt < 0:
+            if len(remaining) > 2 * (n - step):    # drop visited cities once they are the majority
+                remaining = remaining[~visited[remaining]]
+                tree = None
+            if cKDTree is not None:
+                if tree is None:
+                    tree = cKDTree(pts[remaining])
+                k = 8
+                while nxt < 0 and k < len(remaining):
+                    found = remaining[tree.query(pts[current], k=k)[1]]
+                    free = found[~visited[found]]
+                    if len(free):
+                        nxt = int(free[0])
+                    k *= 4
+            if nxt < 0:
+                d = ((pts[remaining] - pts[current]) ** 2).sum(axis=1)
+                d[visited[remaining]] = np.inf
+                nxt = int(remaining[np.argmin(d)])
+        tour.append(nxt)
+        visited[nxt] = True
+        current = nxt
+    tour.append(start)
+    return tour
+
+
+class _ArrayTour:
+    """Tour as an array plus each city's position; 2-opt moves reverse the shorter side."""
+
+    def __init__(self, order):
+        self.order = np.array(order, dtype=np.int64)
+        self.n = len(self.order)
+        self.pos = np.empty(self.n, dtype=np.int64)
+        self.pos[self.order] = np.arange(self.n)
+
+    def succ(self, city):
+        return self.order[(self.pos[city] + 1) % self.n]
+
+    def pred(self, city):
+        return self.order[self.pos[city] - 1]
+
+    def between(self, a, b, c):
+        """True if b lies on the forward path from a to c (inclusive)."""
+        pa, pb, pc = self.pos[a], self.pos[b], self.pos[c]
+        if pa <= pc:
+            return pa <= pb <= pc
+        return pb >= pa or pb <= pc
+
+    def _reverse(self, i, j):
+        """Reverse the forward segment of positions i..j (the complement if that is shorter)."""
+        n = self.n
+        length = (j - i) % n + 1
+        if 2 * length > n:
+            i, j, length = (j + 1) % n, (i - 1) % n, n - length
+        if length < 2:
+            return
+        if i <= j:
+            seg = self.order[i:j + 1][::-1].copy()
+            self.order[i:j + 1] = seg
+            self.pos[seg] = np.arange(i, j + 1)
+        else:
+            idx = (i + np.arange(length)) % n
+            seg = self.order[idx][::-1]
+            self.order[idx] = seg
+            self.pos[seg] = idx
+
+    def move_2opt(self, a, b, c, d):
+        """Replace tour edges (a, b) and (c, d) by (a, c) and (b, d).
+
+        b must follow a and d follow c in the same direction of travel.
+        """
+        if self.succ(a) == b:
+            self._reverse(self.pos[b], self.pos[c])
+        else:
+            self._reverse(self.pos[c], self.pos[b])
+
+    def closed(self):
+        return self.order.tolist() + [int(self.order[0])]
+
+
+def local_search(coords, tour, neighbours=None, or_opt=True, time_limit=None):
+    """Improve a closed tour with 2-opt (and Or-opt) moves; returns HeuristicResult.
+
+    Moves are only tried towards each city's candidate neighbours, and
+    don't-look bits keep a queue of cities whose surroundings changed: a
+    city is re-examined only after a move touches one of its tour edges.
+    time_limit (seconds) stops the search early with the tour found so far.
+    """
+    start_time = time.perf_counter()
+    pts = np.asarray(coords, dtype=np.float64)
+    n = len(pts)
+    if n < 5:
+        return HeuristicResult(_tour_length(pts, tour), list(tour), 0, time.perf_counter() - start_time)
+    if neighbours is None:
+        neighbours = candidate_lists(pts)
+    neigh = neighbours.tolist()
+    xy = pts.tolist()
+    dist = math.dist
+
+    def d(a, b):
+        return dist(xy[a], xy[b])
+
+    t = _ArrayTour(tour[:-1] if tour[0] == tour[-1] else tour)
+    succ, pred = t.succ, t.pred
+    queue = deque(t.order.tolist())
+    active = [True] * n
+    moves = 0
+    checks = 0
+
+    def wake(*cities):
+        for c in cities:
+            if not active[c]:
+                active[c] = True
+                queue.append(c)
+
+    def improve_2opt(a):
+        for forward in (True, False):
+            b = succ(a) if forward else pred(a)
+            d_ab = d(a, b)
+            for c in neigh[a]:
+                g1 = d_ab - d(a, c)
+                if g1 <= EPSILON:
+                    break                          # candidates are sorted by distance
+                e = succ(c) if forward else pred(c)
+                if c == b or e == a:
+                    continue
+                if g1 + d(c, e) - d(b, e) > EPSILON:
+                    t.move_2opt(a, b, c, e)
+                    wake(a, b, c, e)
+                    return True
+        return False
+
+    def improve_or_opt(a):
+        for seg_len in (1, 2, 3):
+            s1, s2 = a, a
+            for _ in range(seg_len - 1):
+                s2 = succ(s2)
+            p, nx = pred(s1), succ(s2)
+            if nx == p or s2 == p:
+                return False
+            removal = d(p, s1) + d(s2, nx) - d(p, nx)
+            if removal <= EPSILON:
+                continue
+            for end in (s1, s2):
+                for c in neigh[end]:
+                    if d(end, c) >= removal:
+                        break
+                    if t.between(s1, c, s2):
+                        continue
+                    for x, y in ((c, succ(c)), (pred(c), c)):
+                        if x == s2 or y == s1:
+                            continue
+                        reversed_gain = removal - (d(x, s2) + d(s1, y) - d(x, y))
+                        forward_gain = removal - (d(x, s1) + d(s2, y) - d(x, y))
+                        if max(reversed_gain, forward_gain) <= EPSILON:
+                            continue
+                        # Segment insertion as two 2-opt moves: x s2..s1 y, then flip to x s1..s2 y
+                        t.move_2opt(p, s1, x, y)
+                        t.move_2opt(p, x, nx, s2)
+                        if forward_gain > reversed_gain:
+                            t.move_2opt(x, s2, s1, y)
+                        wake(p, nx, s1, s2, x, y)
+                        return True
+        return False
+
+    while queue:
+        if time_limit is not None and checks % 256 == 0 and time.perf_counter() - start_time >= time_limit:
+            break
+        checks += 1
+        a = queue.popleft()
+        active[a] = False
+        if improve_2opt(a) or (or_opt and improve_or_opt(a)):
+            moves += 1
+            wake(a)
+    closed = t.closed()
+    return HeuristicResult(_tour_length(pts, closed), closed, moves, time.perf_counter() - start_time)
+
+
+def _tour_length(pts, tour):
+    tour = np.asarray(tour)
+    return float(np.sqrt(((pts[tour[1:]] - pts[tour[:-1]]) ** 2).sum(axis=1)).sum())
+
+
+def tsp_heuristic(coords, time_limit=None, candidates=CANDIDATES, or_opt=True, start=0):
+    """Nearest-neighbour construction followed by local_search(), sharing one candidate list."""
+    start_time = time.perf_counter()
+    pts = np.asarray(coords, dtype=np.float64)
+    neighbours = candidate_lists(pts, candidates)
+    tour = nearest_neighbor_tour(pts, neighbours, start)
+    remaining = None if time_limit is None else max(0.0, time_limit - (time.perf_counter() - start_time))
+    result = local_search(pts, tour, neighbours, or_opt, remaining)
+    return result._replace(elapsed=time.perf_counter() - start_time)
+
+
+# --- Main Program ---
+if __name__ == "__main__":
+    n = 8  # brute force grows fast
+    dist = [[0 if i == j else random.randint(1, 100) for j in range(n)] for i in range(n)]
+
+    start = time.perf_counter()
+    bf_cost, bf_path = tsp_bruteforce(dist)
+    print(f"Brute-force cost: {bf_cost}, path: {bf_path}, time: {time.perf_counter() - start:.4f} sec")
+
+    start = time.perf_counter()
+    hk_cost, hk_path = held_karp(dist)
+    print(f"Held-Karp cost: {hk_cost}, path: {hk_path}, time: {time.perf_counter() - start:.4f} sec")
+
+    start = time.perf_counter()
+    bb = tsp_branch_bound(dist)
+    print(f"Branch and bound cost: {bb.cost}, path: {bb.tour}, nodes: {bb.nodes}, "
+          f"time: {time.perf_counter() - start:.4f} sec")
+
+    start = time.perf_counter()
+    nn_cost, nn_path = tsp_nearest_neighbor(dist)
+    print(f"Nearest Neighbor cost: {nn_cost}, path: {nn_path}, time: {time.perf_counter() - start:.4f} sec")
+    assert bf_cost == hk_cost == bb.cost
+
+    n = 18
+    dist = [[0 if i == j else random.randint(1, 100) for j in range(n)] for i in range(n)]
+    start = time.perf_counter()
+    hk_cost, hk_path = held_karp(dist)
+    print(f"\nHeld-Karp, {n} cities: cost {hk_cost}, time: {time.perf_counter() - start:.4f} sec")
+
+    n = 10000
+    coords = np.random.default_rng(0).random((n, 2)) * 1000
+    start = time.perf_counter()
+    nn_tour = nearest_neighbor_tour(coords)
+    print(f"\nNearest Neighbor, {n} cities: cost {_tour_length(coords, nn_tour):.0f}, "
+          f"time: {time.perf_counter() - start:.4f} sec")
+    result = tsp_heuristic(coords, time_limit=30)
+    print(f"2-opt + Or-opt, {n} cities: cost {result.cost:.0f}, moves: {result.moves}, "
+          f"time: {result.elapsed:.4f} sec")
+
+"""
+Time Complexity:
+Brute Force - O(n!)
+Held-Karp - O(2^n * n^2) time, O(2^n * n) space
+Branch and Bound - exponential in the worst case, usually far fewer nodes than n!
+Nearest Neighbor - O(n^2)
+Candidate lists - O(n log n) with a KD-tree
+2-opt / Or-opt - O(k) per examined city, O(n) worst case per applied move
+"""
@@ -0,0 +1,264 @@
+"""
+Uber fare data pipeline
+Out-of-core replacement for the loading / cleaning cells of Uber.ipynb.
+The notebook reads the whole CSV, copies it, parses the timestamps twice and
+filters outliers on the full frame. Here the CSV is streamed once, in chunks:
+
+  - read_chunks(csv)          -> DataFrames with narrow dtypes (float32
+                                 coordinates and fares, uint8 passengers),
+                                 pickup time parsed once to int64 epoch seconds
+  - TDigest                   -> mergeable streaming quantile sketch, used for
+                                 the 1% / 99% fare cut-offs without holding
+                                 every fare in memory
+  - build_cache(csv, dir)     -> cleaned columns written as raw binary files
+                                 plus meta.json (dtypes, row count, cut-offs,
+                                 source signature)
+  - load(csv) -> UberData     -> memory-mapped columns; the cache is reused
+                                 as long as the CSV is unchanged, so retraining
+                                 never parses the CSV again
+
+    data = load("uber.csv")
+    X, y = data.features()                   # in memory, outliers removed
+    for X, y in data.iter_chunks(1 << 18):   # or chunk by chunk
+        ...
+"""
+
+import json
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+CHUNK_ROWS = 1 << 18                   # CSV rows parsed per step
+DIGEST_COMPRESSION = 500               # t-digest size: about compression / 2 centroids
+OUTLIER_QUANTILES = (0.01, 0.99)       # fares outside (q_low, q_high) are dropped, as in the notebook
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S UTC"
+CACHE_VERSION = 1
+
+TARGET = "fare_amount"
+# Stored columns and their on-disk dtypes. "key" and "Unnamed: 0" are row ids and are never read.
+COLUMNS = {
+    "fare_amount": "float32",
+    "pickup_datetime": "int64",        # epoch seconds
+    "pickup_longitude": "float32",
+    "pickup_latitude": "float32",
+    "dropoff_longitude": "float32",
+    "dropoff_latitude": "float32",
+    "passenger_count": "uint8",
+}
+FEATURES = [c for c in COLUMNS if c != TARGET]
+_READ_DTYPES = {c: ("UInt8" if d == "uint8" else d) for c, d in COLUMNS.items() if c != "pickup_datetime"}
+
+
+# ---------- Streaming quantiles ----------
+class TDigest:
+    """Merging t-digest (Dunning) with the merge step vectorised in NumPy.
+
+    Points and centroids are sorted together and grouped by the integer part
+    of the arcsine scale function k(q) = compression / (2 pi) * asin(2q - 1),
+    which keeps centroids small near q = 0 and q = 1 where the fare cut-offs
+    live. Digests of separate chunks (or processes) can be merged.
+    """
+
+    def __init__(self, compression=DIGEST_COMPRESSION):
+        self.compression = compression
+        self.means = np.zeros(0)
+        self.weights = np.zeros(0)
+        self.min = math.inf
+        self.max = -math.inf
+
+    @property
+    def count(self):
+        return float(self.weights.sum())
+
+    def update(self, values, weights=None):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        weights = np.ones_like(values) if weights is None else np.asarray(weights, dtype=np.float64).ravel()
+        keep = ~np.isnan(values)
+        values, weights = values[keep], weights[keep]
+        if len(values) == 0:
+            return self
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self._compress(np.concatenate([self.means, values]), np.concatenate([self.weights, weights]))
+        return self
+
+    def merge(self, other):
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress(np.concatenate([self.means, other.means]), np.concatenate([self.weights, other.weights]))
+        return self
+
+    def _compress(self, means, weights):
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+        cum = np.cumsum(weights)
+        q_mid = (cum - weights / 2) / cum[-1]
+        k = self.compression / (2 * math.pi) * np.arcsin(2 * q_mid - 1)
+        bucket = np.floor(k)
+        starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    def quantile(self, q):
+        """Estimated q-quantile(s), interpolating between centroid mid-ranks."""
+        if len(self.means) == 0:
+            raise ValueError("quantile of an empty digest")
+        total = self.weights.sum()
+        mids = np.cumsum(self.weights) - self.weights / 2
+        ranks = np.concatenate([[0.0], mids, [total]])
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        result = np.interp(np.asarray(q, dtype=np.float64) * total, ranks, values)
+        return result.item() if np.ndim(result) == 0 else result
+
+
+# ---------- Reading ----------
+def read_chunks(csv_path, chunksize=CHUNK_ROWS):
+    """Yield cleaned DataFrames: narrow dtypes, rows with missing values dropped.
+
+    pickup_datetime comes out as int64 epoch seconds; unparseable timestamps
+    count as missing.
+    """
+    reader = pd.read_csv(csv_path, usecols=list(COLUMNS), dtype=_READ_DTYPES, chunksize=chunksize)
+    for chunk in reader:
+        stamps = pd.to_datetime(chunk["pickup_datetime"], format=DATETIME_FORMAT, errors="coerce")
+        chunk["pickup_datetime"] = stamps
+        chunk = chunk.dropna()
+        chunk["pickup_datetime"] = chunk["pickup_datetime"].to_numpy().astype("datetime64[s]").astype(np.int64)
+        yield chunk.astype(COLUMNS)[list(COLUMNS)]
+
+
+# ---------- Cache ----------
+def _signature(csv_path):
+    st = os.stat(csv_path)
+    return {"path": os.path.abspath(csv_path), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _read_meta(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, "meta.json")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def build_cache(csv_path, cache_dir, chunksize=CHUNK_ROWS, quantiles=OUTLIER_QUANTILES, force=False):
+    """Stream csv_path into cache_dir unless an up-to-date cache is already there.
+
+    Returns the cache metadata. meta.json is written last, so an interrupted
+    build is never mistaken for a valid cache.
+    """
+    signature = _signature(csv_path)
+    meta = _read_meta(cache_dir)
+    if not force and meta and meta.get("version") == CACHE_VERSION and meta.get("source") == signature \
+            and meta.get("quantiles") == list(quantiles):
+        return meta
+
+    os.makedirs(cache_dir, exist_ok=True)
+    meta_path = os.path.join(cache_dir, "meta.json")
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+    digest = TDigest()
+    rows = 0
+    files = {c: open(os.path.join(cache_dir, f"{c}.bin"), "wb") for c in COLUMNS}
+    try:
+        for chunk in read_chunks(csv_path, chunksize):
+            for column, f in files.items():
+                chunk[column].to_numpy().tofile(f)
+            digest.update(chunk[TARGET].to_numpy())
+            rows += len(chunk)
+    finally:
+        for f in files.values():
+            f.close()
+
+    low, high = digest.quantile(quantiles) if rows else (math.nan, math.nan)
+    meta = {
+        "version": CACHE_VERSION,
+        "source": signature,
+        "rows": rows,
+        "dtypes": COLUMNS,
+        "quantiles": list(quantiles),
+        "fare_bounds": [float(low), float(high)],
+    }
+    with open(meta_path, "w") as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+class UberData:
+    """Memory-mapped view of a cache written by build_cache()."""
+
+    def __init__(self, cache_dir):
+        self.meta = _read_meta(cache_dir)
+        if self.meta is None:
+            raise FileNotFoundError(f"no Uber cache in {cache_dir}")
+        rows = self.meta["rows"]
+        self.columns = {
+            c: (np.memmap(os.path.join(cache_dir, f"{c}.bin"), dtype=d, mode="r", shape=(rows,))
+                if rows else np.zeros(0, dtype=d))
+            for c, d in self.meta["dtypes"].items()
+        }
+        self._keep = None
+
+    @property
+    def keep(self):
+        """Boolean mask of rows inside the fare cut-offs (computed once)."""
+        if self._keep is None:
+            low, high = self.meta["fare_bounds"]
+            fare = self.columns[TARGET]
+            self._keep = np.zeros(len(fare), dtype=bool)
+            for s in range(0, len(fare), CHUNK_ROWS):
+                part = fare[s:s + CHUNK_ROWS]
+                self._keep[s:s + CHUNK_ROWS] = (part > low) & (part < high)
+        return self._keep
+
+    def __len__(self):
+        return int(self.keep.sum())
+
+    def _block(self, start, stop, dtype):
+        keep = self.keep[start:stop]
+        X = np.empty((int(keep.sum()), len(FEATURES)), dtype=dtype)
+        for j, c in enumerate(FEATURES):
+            X[:, j] = self.columns[c][start:stop][keep]
+        y = np.asarray(self.columns[TARGET][start:stop][keep], dtype=dtype)
+        return X, y
+
+    def iter_chunks(self, rows=CHUNK_ROWS, dtype=np.float64, with_index=False, first=0):
+        """Yield (X, y) blocks of at most `rows` cached rows, outliers removed.
+
+        with_index=True adds a third item: the cache row number of each row,
+        stable across runs (used for reproducible train/test splits).
+        first skips the cache rows before it (rows a model has already seen).
+        """
+        n = self.meta["rows"]
+        for start in range(first, n, rows):
+            X, y = self._block(start, start + rows, dtype)
+            if len(y):
+                if with_index:
+                    yield X, y, start + np.flatnonzero(self.keep[start:start + rows])
+                else:
+                    yield X, y
+
+    def features(self, dtype=np.float64):
+        """All kept rows as one (X, y) pair."""
+        return self._block(0, self.meta["rows"], dtype)
+
+
+def load(csv_path, cache_dir=None, **options):
+    """UberData for csv_path, building or refreshing the cache when needed."""
+    cache_dir = cache_dir or f"{csv_path}.cache"
+    build_cache(csv_path, cache_dir, **options)
+    return UberData(cache_dir)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    path = sys.argv[1] if len(sys.argv) > 1 else "uber.csv"
+    start = time.perf_counter()
+    data = load(path)
+    print(f"Cache ready in {time.perf_counter() - start:.2f} sec: {data.meta['rows']} clean rows")
+    low, high = data.meta["fare_bounds"]
+    print(f"Fare cut-offs (t-digest): {low:.2f} .. {high:.2f}, {len(data)} rows kept")
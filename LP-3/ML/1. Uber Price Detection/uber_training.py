@@ -0,0 +1,289 @@
+"""
+Uber fare models
+Training for the models of Uber.ipynb on top of uber_pipeline, without
+holding the training set in memory or refitting from scratch when new rows
+arrive:
+
+  - StreamingLinearRegression   -> exact least squares from streamed chunks:
+                                   centred X'X / X'y statistics merged per
+                                   chunk (partial_fit), solved on demand
+  - make_sgd()                  -> StandardScaler + SGDRegressor, both updated
+                                   with partial_fit
+  - make_forest(kind)           -> RandomForestRegressor(n_jobs=-1) or the
+                                   histogram-based HistGradientBoostingRegressor
+  - train_linear / train_forest -> fit or update a model from an UberData cache
+  - save_model / load_model     -> joblib persistence; a loaded model keeps
+                                   learning from new data
+
+Rows are split into train and test by a hash of their cache row number, so
+the split is the same in every run and never needs the data in memory.
+A trained model records, per source CSV, how many cache rows it has
+consumed; updating it with the same CSV trains only rows appended since,
+and a new CSV is trained in full.
+
+    python uber_training.py uber.csv --model fare_lr.joblib
+    python uber_training.py uber.csv --model fare_rf.joblib --forest random_forest
+"""
+
+import argparse
+import time
+
+import joblib
+import numpy as np
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import SGDRegressor
+from sklearn.metrics import mean_squared_error, r2_score
+from sklearn.preprocessing import StandardScaler
+
+import uber_pipeline
+
+TEST_SIZE = 0.2
+SPLIT_SEED = 1                         # random_state of the notebook's train_test_split
+N_ESTIMATORS = 100
+FOREST_SEED = 101
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+
+
+# ---------- Train / test split ----------
+def is_test(index, test_size=TEST_SIZE, seed=SPLIT_SEED):
+    """Boolean mask: rows whose hashed index falls in the test fraction."""
+    h = (np.asarray(index, dtype=np.uint64) + np.uint64(seed)) * _GOLDEN
+    h ^= h >> np.uint64(31)
+    h *= _GOLDEN
+    return (h >> np.uint64(11)).astype(np.float64) / float(1 << 53) < test_size
+
+
+def split_chunks(data, test, rows=uber_pipeline.CHUNK_ROWS, test_size=TEST_SIZE, seed=SPLIT_SEED, first=0):
+    """Yield the (X, y) train (test=False) or test (test=True) part of every chunk from cache row first."""
+    for X, y, index in data.iter_chunks(rows, with_index=True, first=first):
+        mask = is_test(index, test_size, seed)
+        if not test:
+            mask = ~mask
+        if mask.any():
+            yield X[mask], y[mask]
+
+
+# ---------- Consumed rows ----------
+def unseen_start(model, data):
+    """First cache row of data that model has not been trained on (0 for a new model or CSV).
+
+    Models carry a seen_rows_ ledger: source path -> {"size", "rows"} at the
+    last training. A CSV that has shrunk since cannot be an append of the
+    rows already seen, so it is rejected rather than silently retrained.
+    """
+    source = data.meta["source"]
+    record = getattr(model, "seen_rows_", {}).get(source["path"]) if model is not None else None
+    if record is None:
+        return 0
+    if source["size"] < record["size"] or data.meta["rows"] < record["rows"]:
+        raise ValueError(f"{source['path']} has shrunk since the model was trained on it; "
+                         f"train a new model instead of updating this one")
+    return record["rows"]
+
+
+def _mark_seen(model, data):
+    source = data.meta["source"]
+    ledger = dict(getattr(model, "seen_rows_", {}))
+    ledger[source["path"]] = {"size": source["size"], "rows": data.meta["rows"]}
+    model.seen_rows_ = ledger
+    return model
+
+
+# ---------- Linear regression ----------
+class StreamingLinearRegression:
+    """Ordinary least squares fitted chunk by chunk, same result as one big fit.
+
+    Keeps the row count, the feature / target means and the centred scatter
+    matrices, merged across chunks with Chan's pairwise update, which stays
+    accurate with epoch-second timestamps next to coordinates.
+    """
+
+    def __init__(self):
+        self.n_samples_seen_ = 0
+        self._mean_x = None
+        self._mean_y = 0.0
+        self._sxx = None
+        self._sxy = None
+
+    def partial_fit(self, X, y):
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        m = len(y)
+        if m == 0:
+            return self
+        mean_x, mean_y = X.mean(axis=0), y.mean()
+        Xc, yc = X - mean_x, y - mean_y
+        sxx, sxy = Xc.T @ Xc, Xc.T @ yc
+        n = self.n_samples_seen_
+        if n == 0:
+            self._mean_x, self._mean_y, self._sxx, self._sxy = mean_x, mean_y, sxx, sxy
+        else:
+            total = n + m
+            dx, dy = mean_x - self._mean_x, mean_y - self._mean_y
+            scale = n * m / total
+            self._sxx = self._sxx + sxx + scale * np.outer(dx, dx)
+            self._sxy = self._sxy + sxy + scale * dx * dy
+            self._mean_x = self._mean_x + dx * m / total
+            self._mean_y = self._mean_y + dy * m / total
+        self.n_samples_seen_ += m
+        self._solve()
+        return self
+
+    def fit(self, X, y):
+        self.__init__()
+        return self.partial_fit(X, y)
+
+    def _solve(self):
+        # Solve in standardised units: raw X'X mixes ~1e16 (timestamps) with ~1e-3 (degrees)
+        scale = np.sqrt(np.diag(self._sxx))
+        scale[scale == 0] = 1.0
+        beta = np.linalg.lstsq(self._sxx / np.outer(scale, scale), self._sxy / scale, rcond=None)[0]
+        self.coef_ = beta / scale
+        self.intercept_ = self._mean_y - self._mean_x @ self.coef_
+
+    def predict(self, X):
+        return np.asarray(X, dtype=np.float64) @ self.coef_ + self.intercept_
+
+
+class StreamingSGD:
+    """StandardScaler + SGDRegressor, both updated with partial_fit."""
+
+    def __init__(self, **params):
+        self.scaler = StandardScaler()
+        self.model = SGDRegressor(**params)
+
+    def partial_fit(self, X, y):
+        self.scaler.partial_fit(X)
+        self.model.partial_fit(self.scaler.transform(X), y)
+        return self
+
+    def predict(self, X):
+        return self.model.predict(self.scaler.transform(X))
+
+
+def make_sgd(**params):
+    params.setdefault("random_state", SPLIT_SEED)
+    return StreamingSGD(**params)
+
+
+def train_linear(data, model=None, rows=uber_pipeline.CHUNK_ROWS):
+    """Feed the training chunks model has not seen to model.partial_fit (exact OLS by default)."""
+    first = unseen_start(model, data)
+    model = model if model is not None else StreamingLinearRegression()
+    for X, y in split_chunks(data, test=False, rows=rows, first=first):
+        model.partial_fit(X, y)
+    return _mark_seen(model, data)
+
+
+# ---------- Tree ensembles ----------
+def make_forest(kind="random_forest", n_estimators=N_ESTIMATORS, n_jobs=-1):
+    """Tree ensemble with warm_start, so train_forest(data, model) adds trees instead of refitting.
+
+    "random_forest": the notebook's model, trees built on all cores.
+    "hist":          HistGradientBoostingRegressor, features binned to 255
+                     levels once, much faster on millions of rows.
+    """
+    if kind == "random_forest":
+        return RandomForestRegressor(n_estimators=n_estimators, n_jobs=n_jobs,
+                                     random_state=FOREST_SEED, warm_start=True)
+    if kind == "hist":
+        return HistGradientBoostingRegressor(max_iter=n_estimators, random_state=FOREST_SEED,
+                                             warm_start=True, early_stopping=False)
+    raise ValueError(f"unknown forest kind: {kind}")
+
+
+def train_forest(data, model=None, kind="random_forest", n_estimators=N_ESTIMATORS, max_rows=None):
+    """Fit a tree ensemble on the training rows, or grow an existing one on new data.
+
+    Trees need all of their rows at once; max_rows caps how many are used
+    (evenly spaced), and an already-fitted model gets n_estimators more
+    trees / boosting iterations trained on the rows of `data` it has not
+    seen. Without any such rows the model is returned unchanged.
+    """
+    first = unseen_start(model, data)
+    chunks = list(split_chunks(data, test=False, first=first))
+    if not chunks:
+        if model is None:
+            raise ValueError("no training rows")
+        return model
+    X, y = _collect(chunks, max_rows)
+    if model is None:
+        model = make_forest(kind, n_estimators)
+    elif isinstance(model, RandomForestRegressor):
+        model.n_estimators += n_estimators
+    else:
+        model.max_iter += n_estimators
+    return _mark_seen(model.fit(X, y), data)
+
+
+def _collect(chunks, max_rows=None):
+    Xs, ys = zip(*chunks)
+    X, y = np.concatenate(Xs), np.concatenate(ys)
+    if max_rows is not None and len(y) > max_rows:
+        keep = np.linspace(0, len(y) - 1, max_rows).astype(np.int64)
+        X, y = X[keep], y[keep]
+    return X, y
+
+
+# ---------- Evaluation and persistence ----------
+def evaluate(model, data, rows=uber_pipeline.CHUNK_ROWS):
+    """(RMSE, R^2) on the test rows, predicted chunk by chunk."""
+    truth, predicted = [], []
+    for X, y in split_chunks(data, test=True, rows=rows):
+        truth.append(y)
+        predicted.append(model.predict(X))
+    y, p = np.concatenate(truth), np.concatenate(predicted)
+    return float(np.sqrt(mean_squared_error(y, p))), float(r2_score(y, p))
+
+
+def save_model(model, path):
+    joblib.dump(model, path)
+
+
+def load_model(path):
+    return joblib.load(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train or update the Uber fare models")
+    parser.add_argument("csv", help="uber.csv (cached next to it after the first run)")
+    parser.add_argument("--model", help="joblib file: loaded and updated if it exists, then saved")
+    parser.add_argument("--forest", choices=["random_forest", "hist"],
+                        help="train a tree ensemble instead of linear regression")
+    parser.add_argument("--sgd", action="store_true", help="linear model by SGD instead of exact OLS")
+    parser.add_argument("--max-rows", type=int, help="row cap for the tree ensembles")
+    args = parser.parse_args(argv)
+
+    data = uber_pipeline.load(args.csv)
+    model = None
+    if args.model:
+        try:
+            model = load_model(args.model)
+            print(f"Updating {args.model}")
+        except FileNotFoundError:
+            pass
+
+    first = unseen_start(model, data)
+    if model is not None and first == data.meta["rows"]:
+        print(f"No new rows in {args.csv} since the last update; model unchanged")
+    else:
+        if first:
+            print(f"Training on cache rows {first}..{data.meta['rows']} (earlier rows already seen)")
+        start = time.perf_counter()
+        if args.forest:
+            model = train_forest(data, model, kind=args.forest, max_rows=args.max_rows)
+        else:
+            model = train_linear(data, model if model is not None else (make_sgd() if args.sgd else None))
+        print(f"Trained {type(model).__name__} in {time.perf_counter() - start:.2f} sec")
+    rmse, r2 = evaluate(model, data)
+    print(f"RMSE: {rmse:.4f}  R²: {r2:.4f}")
+    if args.model:
+        save_model(model, args.model)
+    return 0
+
+
+if __name__ == "__main__":
+    # Run through the imported module so saved models pickle their classes as
+    # uber_training.*, loadable from anywhere, not as __main__.*
+    import uber_training
+    uber_training.main()
@@ -0,0 +1,299 @@
+"""
+K-Means engine for the sales clustering project
+KMeans_on_sales.ipynb fits KMeans(n_init=10) from scratch for every k of the
+elbow plot, again for every k of the silhouette scan, and once more for
+k = 3, with an O(n^2) silhouette_score each time. Here one sweep does it all:
+
+  - kmeans(X, k)            -> Elkan's k-means (triangle-inequality bounds
+                               skip most point/centre distances) or
+                               mini-batch k-means for large n
+  - sweep(X, ks)            -> each k warm-started from the k-1 centres plus
+                               one k-means++ centre; inertia and a silhouette
+                               estimate per k, labels kept for every k
+  - SilhouetteSample(X)     -> pairwise distances of a fixed random sample,
+                               computed once and reused for every k
+
+    results = sweep(X_scaled, range(1, 11))
+    [r.inertia for r in results]        # elbow
+    [r.silhouette for r in results]     # silhouette (None for k = 1)
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+MAX_ITER = 300
+TOL = 1e-4                             # stop when squared centre shifts sum below TOL * mean feature variance
+NO_IMPROVEMENT = 10                    # mini-batch: stop after this many batches without a better smoothed inertia
+CHUNK_ROWS = 1 << 15                   # rows per distance block when assigning
+SILHOUETTE_SAMPLE = 2000               # sample size for the silhouette estimate
+BATCH_SIZE = 1024                      # mini-batch size
+
+KMeansResult = namedtuple("KMeansResult", "k centers labels inertia n_iter silhouette")
+
+
+# ---------- Distances ----------
+def _sq_dist(X, C, x_sq=None):
+    """Squared Euclidean distances (n, k) by the ||x||^2 - 2 x.c + ||c||^2 expansion."""
+    x_sq = (X * X).sum(axis=1) if x_sq is None else x_sq
+    d = x_sq[:, None] - 2 * X @ C.T + (C * C).sum(axis=1)
+    return np.maximum(d, 0, out=d)
+
+
+def assign(X, C, x_sq=None):
+    """(labels, squared distance to the nearest centre), chunk by chunk."""
+    n = len(X)
+    labels = np.empty(n, dtype=np.int64)
+    best = np.empty(n)
+    for s in range(0, n, CHUNK_ROWS):
+        d = _sq_dist(X[s:s + CHUNK_ROWS], C, None if x_sq is None else x_sq[s:s + CHUNK_ROWS])
+        labels[s:s + CHUNK_ROWS] = d.argmin(axis=1)
+        best[s:s + CHUNK_ROWS] = d[np.arange(len(d)), labels[s:s + CHUNK_ROWS]]
+    return labels, best
+
+
+def _centre_sums(X, labels, k):
+    counts = np.bincount(labels, minlength=k)
+    sums = np.column_stack([np.bincount(labels, weights=X[:, j], minlength=k) for j in range(X.shape[1])])
+    return sums, counts
+
+
+# ---------- Seeding ----------
+def kmeans_plusplus(X, k, rng, centers=None, x_sq=None, trials=None):
+    """Extend `centers` (possibly empty) to k centres by greedy k-means++.
+
+    Each new centre is the best of `trials` candidates drawn with probability
+    proportional to the squared distance to the nearest existing centre.
+    """
+    n = len(X)
+    trials = trials or 2 + int(np.log(k))
+    centers = np.empty((0, X.shape[1])) if centers is None else np.asarray(centers, dtype=np.float64)
+    if len(centers) == 0:
+        centers = X[rng.integers(n)][None, :]
+    closest = assign(X, centers, x_sq)[1]
+    while len(centers) < k:
+        total = closest.sum()
+        if total <= 0:                     # fewer distinct points than k
+            candidates = rng.integers(n, size=trials)
+        else:
+            candidates = np.searchsorted(np.cumsum(closest), rng.random(trials) * total)
+            candidates = np.minimum(candidates, n - 1)
+        options = np.minimum(closest[:, None], _sq_dist(X, X[candidates], x_sq))
+        pick = int(options.sum(axis=0).argmin())
+        centers = np.vstack([centers, X[candidates[pick]]])
+        closest = options[:, pick]
+    return centers
+
+
+# ---------- Elkan ----------
+def elkan(X, centers, max_iter=MAX_ITER, tol=TOL, x_sq=None):
+    """Lloyd iterations with Elkan's bounds; returns (centers, labels, inertia, n_iter).
+
+    Each point keeps an upper bound on the distance to its centre and a lower
+    bound per centre. A point is skipped while its upper bound is below half
+    the distance from its centre to the nearest other centre, and a centre
+    is skipped while the point's bounds rule it out, so late iterations
+    compute only a small fraction of the n x k distances.
+    """
+    C = np.array(centers, dtype=np.float64)
+    k = len(C)
+    lower = np.sqrt(np.concatenate([_sq_dist(X[s:s + CHUNK_ROWS], C) for s in range(0, len(X), CHUNK_ROWS)]))
+    labels = lower.argmin(axis=1)
+    upper = lower[np.arange(len(X)), labels]
+    tol = tol * X.var(axis=0).mean()
+
+    n_iter = 0
+    for n_iter in range(1, max_iter + 1):
+        # Move centres; an empty cluster takes the point farthest from its centre,
+        # which leaves its old cluster (labels, sums and counts follow it)
+        sums, counts = _centre_sums(X, labels, k)
+        moved = []
+        for j in np.flatnonzero(counts == 0):
+            far = int(np.where(counts[labels] > 1, upper, -1.0).argmax())
+            old = labels[far]
+            sums[old] -= X[far]
+            counts[old] -= 1
+            sums[j], counts[j] = X[far], 1
+            labels[far] = j
+            upper[far] = -1.0              # not picked twice; reset below
+            moved.append((far, j))
+        new = np.where(counts[:, None] > 0, sums / np.maximum(counts, 1)[:, None], C)
+        shift = np.sqrt(((new - C) ** 2).sum(axis=1))
+        C = new
+        lower = np.maximum(lower - shift, 0)
+        upper += shift[labels]
+        for far, j in moved:               # the point is the new centre: both bounds are exact
+            upper[far] = 0.0
+            lower[far, j] = 0.0
+        if (shift ** 2).sum() <= tol:
+            break
+
+        cc = np.sqrt(_sq_dist(C, C))
+        np.fill_diagonal(cc, np.inf)
+        half_gap = 0.5 * cc.min(axis=1) if k > 1 else np.full(1, np.inf)
+        rows = np.flatnonzero(upper > half_gap[labels])
+        if len(rows) == 0:
+            continue
+        # Tighten the upper bound of the rows that might move
+        upper[rows] = np.sqrt(((X[rows] - C[labels[rows]]) ** 2).sum(axis=1))
+        lower[rows, labels[rows]] = upper[rows]
+        u = upper[rows, None]
+        candidate = (u > lower[rows]) & (u > 0.5 * cc[labels[rows]])
+        pi, cj = np.nonzero(candidate)
+        if len(pi) == 0:
+            continue
+        d = np.sqrt(((X[rows[pi]] - C[cj]) ** 2).sum(axis=1))
+        lower[rows[pi], cj] = d
+        block = np.full((len(rows), k), np.inf)
+        block[pi, cj] = d
+        best = block.argmin(axis=1)
+        best_d = block[np.arange(len(rows)), best]
+        moved = best_d < upper[rows]
+        labels[rows[moved]] = best[moved]
+        upper[rows[moved]] = best_d[moved]
+
+    labels, d2 = assign(X, C, x_sq)
+    return C, labels, float(d2.sum()), n_iter
+
+
+# ---------- Mini-batch ----------
+def minibatch(X, centers, rng, batch_size=BATCH_SIZE, max_iter=MAX_ITER, tol=TOL, x_sq=None):
+    """Sculley's mini-batch k-means; returns (centers, labels, inertia, n_iter).
+
+    Every centre moves towards the mean of its batch points with a step of
+    (batch points) / (all points it has seen), so early batches move centres
+    far and later ones only refine them. Stops when the centres settle or the
+    smoothed per-point batch inertia has not improved for NO_IMPROVEMENT
+    batches.
+    """
+    C = np.array(centers, dtype=np.float64)
+    k = len(C)
+    seen = np.zeros(k)
+    tol = tol * X.var(axis=0).mean()
+    size = min(batch_size, len(X))
+    alpha = min(1.0, 2 * size / (len(X) + 1))
+    smoothed, best, stale = None, np.inf, 0
+    n_iter = 0
+    for n_iter in range(1, max_iter + 1):
+        batch = X[rng.integers(len(X), size=size)]
+        d = _sq_dist(batch, C)
+        labels = d.argmin(axis=1)
+        cost = d[np.arange(size), labels].mean()
+        smoothed = cost if smoothed is None else (1 - alpha) * smoothed + alpha * cost
+        if smoothed < best:
+            best, stale = smoothed, 0
+        else:
+            stale += 1
+        sums, counts = _centre_sums(batch, labels, k)
+        hit = counts > 0
+        seen[hit] += counts[hit]
+        step = counts[hit] / seen[hit]
+        new = C.copy()
+        new[hit] += step[:, None] * (sums[hit] / counts[hit][:, None] - C[hit])
+        shift = ((new - C) ** 2).sum()
+        C = new
+        if shift <= tol or stale >= NO_IMPROVEMENT:
+            break
+    labels, d2 = assign(X, C, x_sq)
+    return C, labels, float(d2.sum()), n_iter
+
+
+# ---------- Silhouette ----------
+class SilhouetteSample:
+    """Silhouette estimate on a fixed sample whose pairwise distances are computed once."""
+
+    def __init__(self, X, size=SILHOUETTE_SAMPLE, rng=None):
+        rng = rng or np.random.default_rng(0)
+        n = len(X)
+        self.index = np.arange(n) if n <= size else np.sort(rng.choice(n, size, replace=False))
+        S = X[self.index]
+        self.distances = np.sqrt(_sq_dist(S, S))
+
+    def score(self, labels):
+        """Mean silhouette of the sample under the given labels of all n points."""
+        lab = np.asarray(labels)[self.index]
+        classes, codes = np.unique(lab, return_inverse=True)
+        if len(classes) < 2:
+            return None
+        onehot = codes[:, None] == np.arange(len(classes))
+        sizes = onehot.sum(axis=0)
+        totals = self.distances @ onehot                    # (m, clusters): summed distance to each cluster
+        own = sizes[codes]
+        a = totals[np.arange(len(codes)), codes] / np.maximum(own - 1, 1)
+        means = totals / sizes
+        means[np.arange(len(codes)), codes] = np.inf
+        b = means.min(axis=1)
+        s = np.where(own > 1, (b - a) / np.maximum(a, b), 0.0)
+        return float(s.mean())
+
+
+# ---------- Public API ----------
+def kmeans(X, k, method="elkan", seed=0, centers=None, **options):
+    """Fit one k; centers (optional) are extended to k by k-means++."""
+    X = np.asarray(X, dtype=np.float64)
+    rng = np.random.default_rng(seed)
+    x_sq = (X * X).sum(axis=1)
+    init = kmeans_plusplus(X, k, rng, centers, x_sq)
+    if method == "elkan":
+        C, labels, inertia, n_iter = elkan(X, init, x_sq=x_sq, **options)
+    elif method == "minibatch":
+        C, labels, inertia, n_iter = minibatch(X, init, rng, x_sq=x_sq, **options)
+    else:
+        raise ValueError(f"unknown method: {method}")
+    return KMeansResult(k, C, labels, inertia, n_iter, None)
+
+
+def sweep(X, ks=range(1, 11), method="elkan", seed=0, silhouette_sample=SILHOUETTE_SAMPLE, **options):
+    """One KMeansResult per k (ascending), each warm-started from the previous k's centres."""
+    X = np.asarray(X, dtype=np.float64)
+    rng = np.random.default_rng(seed)
+    x_sq = (X * X).sum(axis=1)
+    sample = SilhouetteSample(X, silhouette_sample, np.random.default_rng(seed))
+    results = []
+    centers = None
+    for k in sorted(ks):
+        init = kmeans_plusplus(X, k, rng, centers if centers is not None and len(centers) < k else None, x_sq)
+        if method == "elkan":
+            centers, labels, inertia, n_iter = elkan(X, init, x_sq=x_sq, **options)
+        elif method == "minibatch":
+            centers, labels, inertia, n_iter = minibatch(X, init, rng, x_sq=x_sq, **options)
+        else:
+            raise ValueError(f"unknown method: {method}")
+        results.append(KMeansResult(k, centers, labels, inertia, n_iter, sample.score(labels)))
+    return results
+
+
+def load_sales(path="sales_data_sample.csv"):
+    """Numeric columns of the sales data, IQR-capped and standardised as in the notebook."""
+    import pandas as pd
+
+    df = pd.read_csv(path, encoding="unicode_escape")
+    numeric = df.select_dtypes(include=["int64", "float64"])
+    q1, q3 = numeric.quantile(0.25), numeric.quantile(0.75)
+    iqr = q3 - q1
+    capped = numeric.clip(q1 - 1.5 * iqr, q3 + 1.5 * iqr, axis=1)
+    values = capped.to_numpy(dtype=np.float64)
+    return (values - values.mean(axis=0)) / values.std(axis=0), capped
+
+
+if __name__ == "__main__":
+    import time
+
+    from sklearn.cluster import KMeans
+    from sklearn.metrics import silhouette_score
+
+    X, _ = load_sales()
+    start = time.perf_counter()
+    for k in range(1, 11):
+        KMeans(n_clusters=k, random_state=42, n_init=10).fit(X)
+    for k in range(2, 11):
+        silhouette_score(X, KMeans(n_clusters=k, random_state=42, n_init=10).fit_predict(X))
+    print(f"Notebook (elbow + silhouette refits): {time.perf_counter() - start:.2f} sec")
+
+    for method in ("elkan", "minibatch"):
+        start = time.perf_counter()
+        results = sweep(X, range(1, 11), method=method)
+        print(f"\nOne warm-started {method} sweep: {time.perf_counter() - start:.2f} sec")
+        for r in results:
+            sil = "" if r.silhouette is None else f", silhouette ~ {r.silhouette:.4f}"
+            print(f"K = {r.k}: inertia {r.inertia:.1f}, {r.n_iter} iterations{sil}")
@@ -0,0 +1,237 @@
+"""
+Batched gradient descent
+4_GradientDescent.ipynb minimises the hard-coded f(x) = (x + 3)^2 from one
+scalar start, with a fixed learning rate and x_history appended to a list.
+Here the objective is any vectorised function of points in R^d, and many
+starting points run together as one NumPy batch:
+
+  - minimize(f, grad, x0)     -> x0 is (d,) or (starts, d); f maps (m, d) to
+                                 (m,) and grad maps (m, d) to (m, d) (central
+                                 differences if grad is None). Step rules:
+                                 "fixed" (the notebook's), "armijo"
+                                 (backtracking line search), "momentum", "adam"
+  - multi_start(f, grad, lo, hi, starts)
+                              -> uniform random starts in the box [lo, hi],
+                                 best run reported
+  - OptimizeResult            -> per-start minimiser, value, iterations to
+                                 converge and a converged flag, the history
+                                 array, evaluation counts and evaluations/sec
+
+Starts that converge are frozen and drop out of the batch, so later
+iterations only evaluate the ones still moving. History is off by default;
+history=k keeps every k-th iterate in one array allocated up front,
+(ceil(max_iter / k) + 1, starts, d), and filled in place.
+
+    result = minimize(square, square_grad, np.linspace(-10, 10, 1000)[:, None], method="armijo")
+    result.x[result.fun.argmin()], result.n_iter.max(), result.evals_per_sec
+"""
+
+import time
+from collections import namedtuple
+
+import numpy as np
+
+LEARNING_RATE = 0.1
+MAX_ITER = 1000
+TOL = 1e-6                             # stop a start when its step is shorter than this
+GTOL = 1e-8                            # ... or its gradient norm is below this
+ARMIJO_C = 1e-4                        # sufficient-decrease constant
+ARMIJO_SHRINK = 0.5
+MAX_BACKTRACKS = 30
+MOMENTUM = 0.9
+ADAM_BETAS = (0.9, 0.999)
+ADAM_EPS = 1e-8
+FD_STEP = 1e-6                         # central-difference step when no gradient is given
+METHODS = ("fixed", "armijo", "momentum", "adam")
+
+OptimizeResult = namedtuple("OptimizeResult",
+                            "x fun n_iter converged history f_evals grad_evals elapsed evals_per_sec")
+
+
+# ---------- Objectives ----------
+def square(X):
+    """The notebook's f(x) = (x + 3)^2, summed over coordinates; minimum 0 at x = -3."""
+    return ((X + 3) ** 2).sum(axis=1)
+
+
+def square_grad(X):
+    return 2 * (X + 3)
+
+
+def rosenbrock(X):
+    """Rosenbrock's valley in d dimensions; minimum 0 at x = (1, ..., 1)."""
+    return (100 * (X[:, 1:] - X[:, :-1] ** 2) ** 2 + (1 - X[:, :-1]) ** 2).sum(axis=1)
+
+
+def rosenbrock_grad(X):
+    G = np.zeros_like(X)
+    inner = X[:, 1:] - X[:, :-1] ** 2
+    G[:, :-1] = -400 * X[:, :-1] * inner - 2 * (1 - X[:, :-1])
+    G[:, 1:] += 200 * inner
+    return G
+
+
+def numeric_grad(f, h=FD_STEP):
+    """Batched central differences: one call of f on (2 d m) points per gradient."""
+    def grad(X):
+        m, d = X.shape
+        shifts = np.eye(d) * h
+        points = np.concatenate([X[:, None, :] + shifts, X[:, None, :] - shifts], axis=1)
+        values = f(points.reshape(-1, d)).reshape(m, 2, d)
+        return (values[:, 0] - values[:, 1]) / (2 * h)
+    return grad
+
+
+# ---------- Optimiser ----------
+def minimize(f, grad, x0, method="fixed", learning_rate=LEARNING_RATE, max_iter=MAX_ITER, tol=TOL,
+             gtol=GTOL, history=False, momentum=MOMENTUM, betas=ADAM_BETAS):
+    """Run every start in x0 until it converges or max_iter; returns OptimizeResult.
+
+    n_iter[i] is the number of steps start i took (max_iter if it never
+    converged). A start whose value overflows stops with converged False.
+    history=True records every iterate and history=k every k-th (plus
+    the start); result.history is then (records, starts, d), trimmed to
+    the last iteration any start ran, with a converged start's rows
+    repeating its final point. Otherwise result.history is None.
+    f_evals / grad_evals count evaluated points, not calls.
+    """
+    if method not in METHODS:
+        raise ValueError(f"unknown method: {method} (expected one of {', '.join(METHODS)})")
+    X = np.array(x0, dtype=np.float64, ndmin=2)
+    m, d = X.shape
+    numeric = grad is None
+    if numeric:
+        grad = numeric_grad(f)
+    f_evals = grad_evals = 0
+
+    def value(points):
+        nonlocal f_evals
+        f_evals += len(points)
+        return f(points)
+
+    def gradient(points):
+        nonlocal f_evals, grad_evals
+        if numeric:
+            f_evals += 2 * d * len(points)
+        else:
+            grad_evals += len(points)
+        return grad(points)
+
+    every = int(history)                       # True -> 1, False -> 0
+    trace = np.empty((-(-max_iter // every) + 1, m, d)) if every else None
+    if every:
+        trace[0] = X
+    n_iter = np.full(m, max_iter)
+    converged = np.zeros(m, dtype=bool)
+    velocity = np.zeros_like(X)                # momentum velocity / Adam first moment
+    second = np.zeros_like(X)                  # Adam second moment
+    rate = np.full(m, float(learning_rate))    # Armijo: last accepted step, grown again each iteration
+    live = np.arange(m)
+    start = time.perf_counter()
+    it = 0
+    with np.errstate(over="ignore", invalid="ignore"):    # diverging starts are dropped below
+        fun = value(X)
+        for it in range(1, max_iter + 1):
+            x = X[live]
+            g = gradient(x)
+            if method == "fixed":
+                step = -learning_rate * g
+            elif method == "armijo":
+                step, t = _armijo(value, x, fun[live], g, rate[live])
+                rate[live] = np.minimum(t / ARMIJO_SHRINK, learning_rate)
+            elif method == "momentum":
+                velocity[live] = momentum * velocity[live] - learning_rate * g
+                step = velocity[live]
+            else:
+                b1, b2 = betas
+                velocity[live] = b1 * velocity[live] + (1 - b1) * g
+                second[live] = b2 * second[live] + (1 - b2) * g * g
+                m_hat = velocity[live] / (1 - b1 ** it)
+                v_hat = second[live] / (1 - b2 ** it)
+                step = -learning_rate * m_hat / (np.sqrt(v_hat) + ADAM_EPS)
+            X[live] = x + step
+            fun[live] = value(X[live])
+            if every and it % every == 0:
+                trace[it // every] = X
+
+            done = (np.sqrt((step * step).sum(axis=1)) < tol) | (np.sqrt((g * g).sum(axis=1)) < gtol)
+            diverged = ~np.isfinite(fun[live])
+            if done.any() or diverged.any():
+                n_iter[live[done | diverged]] = it
+                converged[live[done & ~diverged]] = True
+                live = live[~(done | diverged)]
+            if len(live) == 0:
+                break
+    elapsed = time.perf_counter() - start
+    if every:
+        if it % every:                         # keep the final iterate as the last record
+            trace[it // every + 1] = X
+        trace = trace[:it // every + 1 + (it % every > 0)]
+    return OptimizeResult(X if m > 1 or np.ndim(x0) == 2 else X[0], fun, n_iter, converged, trace,
+                          f_evals, grad_evals, elapsed, (f_evals + grad_evals) / max(elapsed, 1e-12))
+
+
+def _armijo(value, x, fx, g, t0):
+    """Backtracking steps -t g with f(x - t g) <= f(x) - c t |g|^2; returns (steps, t).
+
+    Every start begins from its own t0 and shrinks it until the sufficient
+    decrease holds; only the starts still failing are evaluated again.
+    """
+    t = np.array(t0, dtype=np.float64)
+    slope = (g * g).sum(axis=1)
+    pending = np.arange(len(x))
+    for _ in range(MAX_BACKTRACKS):
+        trial = value(x[pending] - t[pending, None] * g[pending])
+        ok = trial <= fx[pending] - ARMIJO_C * t[pending] * slope[pending]
+        pending = pending[~ok]
+        if len(pending) == 0:
+            break
+        t[pending] *= ARMIJO_SHRINK
+    return -t[:, None] * g, t
+
+
+def multi_start(f, grad, lo, hi, starts=100, seed=0, **options):
+    """minimize() from `starts` uniform points in [lo, hi]; returns (best x, best value, result)."""
+    lo, hi = np.atleast_1d(np.asarray(lo, dtype=np.float64)), np.atleast_1d(np.asarray(hi, dtype=np.float64))
+    x0 = np.random.default_rng(seed).uniform(lo, hi, size=(starts, len(lo)))
+    result = minimize(f, grad, x0, **options)
+    best = int(np.nanargmin(np.where(np.isfinite(result.fun), result.fun, np.nan)))
+    return result.x[best], float(result.fun[best]), result
+
+
+# ---------- Main Program ----------
+if __name__ == "__main__":
+    def f(x):
+        return (x + 3) ** 2
+
+    def grad_f(x):
+        return 2 * (x + 3)
+
+    def gradient_descent(start_x=2, learning_rate=0.1, max_iter=50, tol=1e-6):
+        x = start_x
+        x_history = [x]
+        for i in range(max_iter):
+            x_new = x - learning_rate * grad_f(x)
+            x_history.append(x_new)
+            if abs(x_new - x) < tol:
+                break
+            x = x_new
+        return x, f(x), x_history
+
+    starts = np.linspace(-10, 10, 10000)
+    start = time.perf_counter()
+    loop = [gradient_descent(s, max_iter=MAX_ITER)[0] for s in starts]
+    print(f"Notebook loop, {len(starts)} starts: {time.perf_counter() - start:.3f} sec")
+    result = minimize(square, square_grad, starts[:, None])
+    print(f"One batch: {result.elapsed:.3f} sec, max |difference| "
+          f"{np.abs(result.x[:, 0] - loop).max():.2e}, {result.evals_per_sec:,.0f} evaluations/sec")
+
+    d = 20
+    print(f"\nRosenbrock, d = {d}, 200 starts in [-2, 2]^d")
+    for method, lr in (("fixed", 1e-3), ("armijo", 1.0), ("momentum", 1e-4), ("adam", 0.02)):
+        x, fx, r = multi_start(rosenbrock, rosenbrock_grad, [-2] * d, [2] * d, starts=200,
+                               method=method, learning_rate=lr, max_iter=20000)
+        iters = r.n_iter[r.converged]
+        median = f"{np.median(iters):.0f}" if len(iters) else "-"
+        print(f"{method:>8}: best f = {fx:.3e}, converged {r.converged.sum()}/{len(r.converged)} "
+              f"(median {median} iterations), {r.elapsed:.2f} sec, {r.evals_per_sec:,.0f} evaluations/sec")
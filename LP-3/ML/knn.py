@@ -0,0 +1,137 @@
+"""
+K-nearest-neighbours service
+Shared by the diabetes (5. KNN on Diabetes) and spam (2. Email Spam
+Classification) projects, which both refit KNeighborsClassifier for every
+k and so recompute every neighbour list from scratch.
+
+  - KNNIndex(X, y)                -> scaler + KD-tree / ball tree (brute force
+                                     for sparse input), built once
+  - index.predict_many(X, ks)     -> {k: labels} for every k from a single
+                                     query of max(ks) neighbours
+  - index.predict(X, k)           -> labels, computed in fixed-size batches so
+                                     memory stays bounded for large scoring sets
+  - index.iter_predict(batches, k)-> the same over an iterable of batches
+  - sweep(X_train, y_train, X_test, y_test, ks) -> {k: accuracy}
+
+From a project folder:
+    sys.path.append("..")
+    from knn import KNNIndex
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.metrics import accuracy_score
+from sklearn.neighbors import NearestNeighbors
+from sklearn.preprocessing import StandardScaler
+
+BATCH_ROWS = 4096                      # query rows per batch in predict / predict_many
+KD_TREE_MAX_DIMS = 15                  # above this a ball tree prunes better
+
+
+def vote(codes, ks, n_classes):
+    """{k: winning class code among the first k neighbours} for every k.
+
+    codes is (n_queries, max_k) class codes in order of distance. Votes are
+    cumulative counts per class, so each k is one slice; ties go to the
+    smallest class, as in KNeighborsClassifier.
+    """
+    counts = np.cumsum(codes[:, :, None] == np.arange(n_classes), axis=1, dtype=np.int32)
+    return {k: counts[:, k - 1].argmax(axis=1) for k in ks}
+
+
+class KNNIndex:
+    """Training set scaled and indexed once, queried for any k afterwards."""
+
+    def __init__(self, X, y, scale=True, algorithm=None, leaf_size=40, batch_rows=BATCH_ROWS):
+        sparse = sp.issparse(X)
+        X = X.astype(np.float64) if sparse else np.asarray(X, dtype=np.float64)
+        # Centring would densify sparse input and never changes Euclidean distances
+        self.scaler = StandardScaler(with_mean=not sparse).fit(X) if scale else None
+        if algorithm is None:
+            algorithm = "brute" if sparse else ("kd_tree" if X.shape[1] <= KD_TREE_MAX_DIMS else "ball_tree")
+        self.index = NearestNeighbors(algorithm=algorithm, leaf_size=leaf_size).fit(self._transform(X))
+        self.classes_, self._codes = np.unique(np.asarray(y), return_inverse=True)
+        self.batch_rows = batch_rows
+
+    def __len__(self):
+        return len(self._codes)
+
+    def _transform(self, X):
+        if sp.issparse(X):
+            X = X.astype(np.float64)
+        else:
+            X = np.asarray(X, dtype=np.float64)
+        return X if self.scaler is None else self.scaler.transform(X)
+
+    def _check_k(self, k):
+        if not 1 <= k <= len(self):
+            raise ValueError(f"k must be between 1 and {len(self)}, got {k}")
+
+    def kneighbors(self, X, k):
+        """(n, k) training-row indices of the k nearest neighbours, nearest first."""
+        self._check_k(k)
+        out = np.empty((X.shape[0], k), dtype=np.int64)
+        for start in range(0, X.shape[0], self.batch_rows):
+            batch = self._transform(X[start:start + self.batch_rows])
+            out[start:start + self.batch_rows] = self.index.kneighbors(batch, k, return_distance=False)
+        return out
+
+    def predict_many(self, X, ks):
+        """{k: predicted labels} for every k in ks from one max(ks) query per batch."""
+        ks = sorted(set(ks))
+        for k in ks:
+            self._check_k(k)
+        n = X.shape[0]
+        out = {k: np.empty(n, dtype=self.classes_.dtype) for k in ks}
+        for start in range(0, n, self.batch_rows):
+            batch = self._transform(X[start:start + self.batch_rows])
+            neighbours = self.index.kneighbors(batch, ks[-1], return_distance=False)
+            for k, codes in vote(self._codes[neighbours], ks, len(self.classes_)).items():
+                out[k][start:start + len(codes)] = self.classes_[codes]
+        return out
+
+    def predict(self, X, k):
+        return self.predict_many(X, [k])[k]
+
+    def iter_predict(self, batches, k):
+        """Yield predictions for each batch of an iterable (e.g. a chunked reader)."""
+        for batch in batches:
+            yield self.predict(batch, k)
+
+
+def sweep(X_train, y_train, X_test, y_test, ks, scale=True, metric=accuracy_score):
+    """{k: metric(y_test, prediction)} with one index and one neighbour query."""
+    predictions = KNNIndex(X_train, y_train, scale=scale).predict_many(X_test, ks)
+    return {k: metric(y_test, pred) for k, pred in predictions.items()}
+
+
+if __name__ == "__main__":
+    import os
+    import time
+
+    import pandas as pd
+    from sklearn.model_selection import train_test_split
+    from sklearn.neighbors import KNeighborsClassifier
+
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "5. KNN on Diabetes", "diabetes.csv")
+    data = pd.read_csv(path)
+    for column in ["Glucose", "BloodPressure", "SkinThickness", "Insulin", "BMI"]:
+        data[column] = data[column].replace(0, np.nan)
+        data[column] = data[column].fillna(round(data[column].mean(skipna=True)))
+    X_train, X_test, y_train, y_test = train_test_split(data.iloc[:, :8], data["Outcome"],
+                                                        test_size=0.2, random_state=0)
+    ks = [3, 5, 7]
+
+    start = time.perf_counter()
+    refit = {}
+    for k in ks:
+        scaler = StandardScaler().fit(X_train)
+        model = KNeighborsClassifier(n_neighbors=k).fit(scaler.transform(X_train), y_train)
+        refit[k] = accuracy_score(y_test, model.predict(scaler.transform(X_test)))
+    print(f"Refit per k: {time.perf_counter() - start:.4f} sec")
+
+    start = time.perf_counter()
+    once = sweep(X_train, y_train, X_test, y_test, ks)
+    print(f"One index, one query: {time.perf_counter() - start:.4f} sec")
+    for k in ks:
+        print(f"K = {k} → Accuracy = {once[k] * 100:.2f}% (refit: {refit[k] * 100:.2f}%)")
@@ -0,0 +1,196 @@
+"""
+Model-selection runner
+Cross-validated hyperparameter search for the KNN (diabetes) and spam
+projects, which currently score every setting on one train_test_split and
+redo the preprocessing in every experiment:
+
+  - ZeroMeanImputer(columns)  -> the diabetes notebook's "replace 0 by the
+                                 rounded column mean", as a fit/transform step
+  - FoldCache(dir)            -> preprocessing fitted once per fold and stored
+                                 on disk under a content hash of (data, fold
+                                 rows, preprocessing parameters); any later
+                                 search on the same data reuses it
+  - search(model, grid, X, y) -> folds x parameter settings fanned out over a
+                                 process pool, with successive halving: every
+                                 setting is scored on one fold, the best 1/eta
+                                 go on to eta times as many folds, and so on
+
+    result = search(KNeighborsClassifier, {"n_neighbors": range(1, 51)}, X, y,
+                    preprocess=diabetes_preprocessing())
+    result.best_params, result.best_score
+"""
+
+import math
+import os
+import tempfile
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import numpy as np
+from sklearn.base import BaseEstimator, TransformerMixin, clone
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import KFold, ParameterGrid, StratifiedKFold
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+N_SPLITS = 5
+ETA = 3                                # successive-halving reduction factor
+DIABETES_ZERO_COLUMNS = ["Glucose", "BloodPressure", "SkinThickness", "Insulin", "BMI"]
+DEFAULT_CACHE = os.path.join(tempfile.gettempdir(), "lp3_model_selection")
+
+SearchResult = namedtuple("SearchResult", "best_params best_score results elapsed")
+
+
+# ---------- Preprocessing ----------
+class ZeroMeanImputer(BaseEstimator, TransformerMixin):
+    """Replace zeros in the given columns by the rounded mean of their non-zero values.
+
+    columns are names (DataFrame input) or positions. Unlike the notebook,
+    the means come from the rows passed to fit(), so a test fold never leaks
+    into them.
+    """
+
+    def __init__(self, columns=None):
+        self.columns = columns
+
+    def _positions(self, X):
+        if self.columns is None:
+            return list(range(X.shape[1]))
+        if hasattr(X, "columns"):
+            return [X.columns.get_loc(c) if not isinstance(c, int) else c for c in self.columns]
+        return list(self.columns)
+
+    def fit(self, X, y=None):
+        self.positions_ = self._positions(X)
+        values = np.asarray(X, dtype=np.float64)[:, self.positions_]
+        nonzero = values != 0
+        means = (values * nonzero).sum(axis=0) / np.maximum(nonzero.sum(axis=0), 1)
+        self.fill_ = np.round(means)
+        return self
+
+    def transform(self, X):
+        X = np.array(X, dtype=np.float64)
+        block = X[:, self.positions_]
+        X[:, self.positions_] = np.where(block == 0, self.fill_, block)
+        return X
+
+
+def diabetes_preprocessing():
+    """The diabetes notebook's preprocessing: zero -> mean imputation, then StandardScaler."""
+    return make_pipeline(ZeroMeanImputer(DIABETES_ZERO_COLUMNS), StandardScaler())
+
+
+# ---------- Per-fold cache ----------
+class FoldCache:
+    """Preprocessed folds on disk, keyed by a content hash.
+
+    The key covers the data, the fold's train/test rows and the unfitted
+    preprocessor's parameters, so a changed input can never hit a stale
+    entry. Entries are joblib files opened with mmap_mode="r", so worker
+    processes share the page cache instead of unpickling copies.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def prepare(self, preprocess, X, y, train, test, data_key=None):
+        """Path of the cached (X_train, y_train, X_test, y_test) for one fold, built if missing."""
+        data_key = data_key or joblib.hash((X, y))
+        key = joblib.hash((data_key, train, test, preprocess))
+        path = os.path.join(self.cache_dir, f"fold-{key}.joblib")
+        if not os.path.exists(path):
+            X_train, X_test = _rows(X, train), _rows(X, test)
+            if preprocess is not None:
+                fitted = clone(preprocess).fit(X_train, y[train])
+                X_train, X_test = fitted.transform(X_train), fitted.transform(X_test)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            joblib.dump((np.asarray(X_train) if not hasattr(X_train, "tocsr") else X_train, y[train],
+                         np.asarray(X_test) if not hasattr(X_test, "tocsr") else X_test, y[test]), tmp)
+            os.replace(tmp, path)          # atomic: concurrent searches never read half a file
+        return path
+
+
+def _rows(X, index):
+    return X.iloc[index] if hasattr(X, "iloc") else X[index]
+
+
+# ---------- Search ----------
+def _score(task):
+    """Worker: fit one setting on one cached fold and score it."""
+    path, model, params, scoring = task
+    X_train, y_train, X_test, y_test = joblib.load(path, mmap_mode="r")
+    estimator = model(**params) if isinstance(model, type) else clone(model).set_params(**params)
+    estimator.fit(X_train, y_train)
+    return scoring(y_test, estimator.predict(X_test))
+
+
+def _budgets(n_configs, n_splits, eta):
+    """Fold budgets per round: ends at n_splits, each earlier round eta times smaller."""
+    rounds = max(0, min(math.ceil(math.log(max(n_configs, 1), eta)), math.ceil(math.log(n_splits, eta))))
+    budgets = [math.ceil(n_splits / eta ** r) for r in range(rounds, 0, -1)] + [n_splits]
+    return sorted(set(budgets))
+
+
+def search(model, param_grid, X, y, preprocess=None, n_splits=N_SPLITS, halving=True, eta=ETA,
+           scoring=accuracy_score, cache_dir=DEFAULT_CACHE, workers=None, seed=0, stratify=True):
+    """Cross-validated search over param_grid; returns SearchResult.
+
+    model is an estimator class (called with each setting) or an estimator
+    instance (cloned and set_params'd); it and scoring must be picklable.
+    With halving=False every setting is scored on every fold. results lists
+    {"params", "scores", "mean"} per setting, best first; settings dropped
+    by halving keep the scores of the folds they ran on.
+    """
+    start_time = time.perf_counter()
+    y = np.asarray(y)
+    configs = list(ParameterGrid(param_grid))
+    splitter = (StratifiedKFold if stratify else KFold)(n_splits=n_splits, shuffle=True, random_state=seed)
+    cache = FoldCache(cache_dir)
+    data_key = joblib.hash((X, y))
+    folds = [cache.prepare(preprocess, X, y, train, test, data_key)
+             for train, test in splitter.split(np.zeros(len(y)), y)]
+
+    scores = [[] for _ in configs]
+    alive = list(range(len(configs)))
+    budgets = _budgets(len(configs), n_splits, eta) if halving else [n_splits]
+    workers = workers or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for budget in budgets:
+            tasks = [(c, f) for c in alive for f in range(len(scores[c]), budget)]
+            jobs = [(folds[f], model, configs[c], scoring) for c, f in tasks]
+            chunksize = max(1, len(jobs) // (4 * workers))
+            results = pool.map(_score, jobs, chunksize=chunksize) if pool else map(_score, jobs)
+            for (c, _), value in zip(tasks, results):
+                scores[c].append(value)
+            if budget < n_splits:
+                alive.sort(key=lambda c: np.mean(scores[c]), reverse=True)
+                alive = alive[:max(1, math.ceil(len(alive) / eta))]
+    finally:
+        if pool:
+            pool.shutdown()
+
+    table = [{"params": configs[c], "scores": scores[c], "mean": float(np.mean(scores[c]))}
+             for c in range(len(configs))]
+    table.sort(key=lambda r: (len(r["scores"]), r["mean"]), reverse=True)
+    best = table[0]
+    return SearchResult(best["params"], best["mean"], table, time.perf_counter() - start_time)
+
+
+if __name__ == "__main__":
+    import pandas as pd
+    from sklearn.neighbors import KNeighborsClassifier
+
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "5. KNN on Diabetes", "diabetes.csv")
+    data = pd.read_csv(path)
+    X, y = data.iloc[:, :8], data["Outcome"]
+    grid = {"n_neighbors": list(range(1, 51)), "weights": ["uniform", "distance"], "p": [1, 2]}
+
+    for halving in (False, True):
+        result = search(KNeighborsClassifier, grid, X, y, preprocess=diabetes_preprocessing(), halving=halving)
+        label = "Successive halving" if halving else "Full grid"
+        print(f"{label}: best {result.best_params} -> {result.best_score:.4f} "
+              f"({sum(len(r['scores']) for r in result.results)} fits, {result.elapsed:.2f} sec)")
@@ -44,8 +44,10 @@ def fib_recursive(n):              # Define a function to find the nth Fibonacci
 n = int(input("Enter number of terms: "))     # Take user input for number of Fibonacci terms to print
 
 print("\nFibonacci Series using Iteration:")  # Display title for iterative Fibonacci
-for i in range(n):                            # Loop through 0 to n-1
-    print(fib_iterative(i), end=" ")          # Print each Fibonacci number using iterative method
+a, b = 0, 1                                   # Keep the last two terms instead of calling fib_iterative(i) for every i
+for i in range(n):                            # Loop through 0 to n-1 (whole series is O(n), not O(n^2))
+    print(a, end=" ")                         # Print current Fibonacci number
+    a, b = b, a + b                           # Move one step ahead in the series
 
 print("\n\nFibonacci Series using Recursion:") # Display title for recursive Fibonacci
 for i in range(n):                             # Loop through 0 to n-1
@@ -0,0 +1,267 @@
+"""
+Hierarchical clustering engine for the sales segmentation project
+Step 10 of the notebook calls scipy's linkage(data_scaled, method='ward'),
+which holds the whole O(n^2) distance matrix in RAM. That is fine for the
+2,823 rows of sales_data_sample.csv, but not for millions of order lines:
+
+  - condensed_distances(X, path)
+                               -> the condensed (scipy pdist-ordered) distance
+                                  matrix written block by block to a memmap
+                                  at path (the caller deletes it when done)
+  - nn_chain(D, n, method)     -> nearest-neighbour-chain agglomeration on that
+                                  memmap with Lance-Williams updates in place;
+                                  only O(n) arrays are held in memory
+  - summarise(X, threshold)    -> BIRCH pre-summarisation: millions of rows
+                                  become a few thousand weighted subcluster
+                                  centroids (sklearn Birch, streamed in chunks)
+  - linkage(X, method, ...)    -> all of the above; Z is a scipy linkage matrix,
+                                  so dendrogram(Z) and fcluster(Z, ...) work as
+                                  in the notebook
+  - cut(result, k)             -> k flat clusters for every original row
+
+Ward merges of weighted centroids are exact: the cost of merging two groups
+depends only on their sizes and centroids. Complete / average / single
+linkage of summarised data use centroid distances and are an approximation
+below the subcluster level.
+
+    result = linkage(data_scaled, "ward", threshold=0.3)
+    dendrogram(result.Z, truncate_mode="lastp", p=30)
+    labels = cut(result, 4)
+"""
+
+import os
+import tempfile
+from collections import namedtuple
+
+import numpy as np
+from scipy.cluster.hierarchy import fcluster
+from scipy.spatial.distance import cdist
+from sklearn.cluster import Birch
+
+METHODS = ("ward", "complete", "average", "single")
+BLOCK_ELEMENTS = 1 << 22               # distances computed per block while writing the memmap
+CHUNK_ROWS = 1 << 16                   # rows per BIRCH partial_fit / assignment chunk
+THRESHOLD = 0.5                        # BIRCH subcluster radius (in the units of X)
+BRANCHING_FACTOR = 50
+
+Summary = namedtuple("Summary", "centers counts labels")
+HierarchyResult = namedtuple("HierarchyResult", "Z leaf_labels counts")
+
+
+# ---------- Condensed distance matrix ----------
+def _offset(n, i):
+    """Condensed index of the pair (i, i + 1)."""
+    return i * (2 * n - i - 1) // 2
+
+
+def condensed_distances(X, path, weights=None, method="ward", dtype=np.float64):
+    """Pairwise distances in pdist order, written to a .npy memmap at path.
+
+    The file belongs to the caller, who deletes it when done (linkage()
+    does this for its own temporary file).
+
+    With weights (subcluster sizes) and Ward linkage the initial distances
+    are sqrt(2 w_i w_j / (w_i + w_j)) * ||x_i - x_j||, scipy's Ward distance
+    between groups of those sizes; for unit weights this is plain Euclidean.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    n = len(X)
+    D = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=(max(n * (n - 1) // 2, 1),))
+    w = None if weights is None or method != "ward" else np.asarray(weights, dtype=np.float64)
+    rows = max(1, BLOCK_ELEMENTS // max(n, 1))
+    for start in range(0, n - 1, rows):
+        stop = min(start + rows, n - 1)
+        block = cdist(X[start:stop], X[start + 1:])
+        for i in range(start, stop):
+            d = block[i - start, i - start:]
+            if w is not None:
+                d = d * np.sqrt(2 * w[i] * w[i + 1:] / (w[i] + w[i + 1:]))
+            D[_offset(n, i):_offset(n, i + 1)] = d
+    D.flush()
+    return D
+
+
+def _row_index(n, i, cols):
+    """Condensed indices of the pairs (i, j) for j in cols (all j != i)."""
+    lo, hi = cols[cols < i], cols[cols > i]
+    return np.concatenate([_offset(n, lo) + i - lo - 1, _offset(n, i) + hi - i - 1])
+
+
+# ---------- Nearest-neighbour chain ----------
+def _ward(da, db, dab, na, nb, nk):
+    total = na + nb + nk
+    return np.sqrt(np.maximum(((na + nk) * da * da + (nb + nk) * db * db - nk * dab * dab) / total, 0))
+
+
+_UPDATES = {
+    "ward": _ward,
+    "complete": lambda da, db, dab, na, nb, nk: np.maximum(da, db),
+    "average": lambda da, db, dab, na, nb, nk: (na * da + nb * db) / (na + nb),
+    "single": lambda da, db, dab, na, nb, nk: np.minimum(da, db),
+}
+
+
+def nn_chain(D, n, method="ward", sizes=None):
+    """Agglomerate n clusters from condensed distances D (overwritten); returns a linkage matrix.
+
+    The chain follows nearest neighbours until two clusters are each other's
+    nearest, merges them and carries on from the rest of the chain. Every
+    method here is reducible, so this gives the same hierarchy as the
+    classic algorithm in O(n^2) time, reading one row of D at a time.
+    sizes gives the starting cluster sizes (1 each by default); they weight
+    the Ward update, while Z[:, 3] counts leaves as scipy requires.
+    """
+    if method not in _UPDATES:
+        raise ValueError(f"unknown method: {method} (expected one of {', '.join(METHODS)})")
+    update = _UPDATES[method]
+    size = np.ones(n) if sizes is None else np.array(sizes, dtype=np.float64)
+    active = np.ones(n, dtype=bool)
+    merges = np.empty((max(n - 1, 0), 3))
+    chain = []
+    for step in range(n - 1):
+        if not chain:
+            chain.append(int(active.argmax()))
+        while True:
+            x = chain[-1]
+            cols = np.flatnonzero(active)
+            cols = cols[cols != x]
+            d = D[_row_index(n, x, cols)]
+            j = int(d.argmin())
+            y, best = int(cols[j]), d[j]
+            if len(chain) > 1:
+                prev = chain[-2]
+                d_prev = D[_row_index(n, x, np.array([prev]))][0]
+                if d_prev <= best:         # ties go to the previous link, so the chain terminates
+                    y, best = prev, d_prev
+            if len(chain) > 1 and y == chain[-2]:
+                break
+            chain.append(y)
+        chain.pop()
+        chain.pop()
+
+        a, b = min(x, y), max(x, y)
+        merges[step] = a, b, best
+        active[a] = active[b] = False
+        cols = np.flatnonzero(active)
+        if len(cols):
+            ia, ib = _row_index(n, a, cols), _row_index(n, b, cols)
+            D[ib] = update(D[ia], D[ib], best, size[a], size[b], size[cols])
+        active[b] = True                   # the merged cluster lives on in slot b
+        size[b] += size[a]
+    return _label(merges, n)
+
+
+def _label(merges, n):
+    """Sort merges by height and renumber them the scipy way (new cluster n + i)."""
+    merges = merges[np.argsort(merges[:, 2], kind="mergesort")]
+    parent = np.arange(2 * n - 1)
+    count = np.ones(2 * n - 1)
+
+    def find(i):
+        root = i
+        while parent[root] != root:
+            root = parent[root]
+        while parent[i] != root:
+            parent[i], i = root, parent[i]
+        return root
+
+    Z = np.empty((len(merges), 4))
+    for i, (a, b, dist) in enumerate(merges):
+        ra, rb = find(int(a)), find(int(b))
+        Z[i] = min(ra, rb), max(ra, rb), dist, count[ra] + count[rb]
+        parent[ra] = parent[rb] = n + i
+        count[n + i] = Z[i, 3]
+    return Z
+
+
+# ---------- BIRCH pre-summarisation ----------
+def summarise(X, threshold=THRESHOLD, branching_factor=BRANCHING_FACTOR, chunk_rows=CHUNK_ROWS):
+    """Weighted subcluster centroids of X; returns Summary(centers, counts, labels).
+
+    The CF tree is built with Birch.partial_fit one chunk at a time, then a
+    second chunked pass assigns every row to its nearest subcluster and the
+    centroids are recomputed from those rows, so centers, counts and labels
+    agree exactly. Subclusters left without rows are dropped.
+    """
+    birch = Birch(threshold=threshold, branching_factor=branching_factor, n_clusters=None)
+    for start in range(0, len(X), chunk_rows):
+        birch.partial_fit(np.asarray(X[start:start + chunk_rows], dtype=np.float64))
+    m = len(birch.subcluster_centers_)
+    labels = np.empty(len(X), dtype=np.int64)
+    sums = np.zeros((m, X.shape[1]))
+    for start in range(0, len(X), chunk_rows):
+        chunk = np.asarray(X[start:start + chunk_rows], dtype=np.float64)
+        lab = birch.predict(chunk)
+        labels[start:start + len(chunk)] = lab
+        np.add.at(sums, lab, chunk)
+    counts = np.bincount(labels, minlength=m)
+    keep = counts > 0
+    relabel = np.cumsum(keep) - 1
+    return Summary(sums[keep] / counts[keep][:, None], counts[keep], relabel[labels])
+
+
+# ---------- Public API ----------
+def linkage(X, method="ward", threshold=None, path=None):
+    """Hierarchy of X; returns HierarchyResult(Z, leaf_labels, counts).
+
+    threshold=None clusters the rows themselves (Z matches scipy's linkage).
+    Otherwise X is first summarised by BIRCH with that radius: Z is over the
+    subclusters (Z[:, 3] counts subclusters), leaf_labels maps every row to
+    its subcluster and counts are the subcluster sizes. The condensed matrix
+    goes to path (a temporary file, removed afterwards, if None).
+    """
+    if threshold is None:
+        points, counts, leaf_labels = np.asarray(X, dtype=np.float64), None, np.arange(len(X))
+    else:
+        points, counts, leaf_labels = summarise(X, threshold)
+    own_file = path is None
+    if own_file:
+        fd, path = tempfile.mkstemp(suffix=".condensed.npy")
+        os.close(fd)
+    try:
+        D = condensed_distances(points, path, counts, method)
+        Z = nn_chain(D, len(points), method, counts)
+        del D
+    finally:
+        if own_file:
+            os.remove(path)
+    return HierarchyResult(Z, leaf_labels, counts)
+
+
+def cut(result, k):
+    """Flat cluster labels (1..k) for every original row, as fcluster(Z, k, 'maxclust')."""
+    if len(result.Z) == 0:
+        return np.ones(len(result.leaf_labels), dtype=np.int32)
+    return fcluster(result.Z, k, criterion="maxclust")[result.leaf_labels]
+
+
+# ---------- Main Program ----------
+if __name__ == "__main__":
+    import time
+
+    import pandas as pd
+    from scipy.cluster import hierarchy
+    from sklearn.preprocessing import StandardScaler
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    df = pd.read_csv(os.path.join(here, "sales_data_sample.csv"), encoding="latin1")
+    data = df[["SALES", "QUANTITYORDERED", "PRICEEACH"]].dropna()
+    data_scaled = StandardScaler().fit_transform(data)
+
+    start = time.perf_counter()
+    reference = hierarchy.linkage(data_scaled, method="ward")
+    print(f"scipy linkage (in-memory distances): {time.perf_counter() - start:.2f} sec")
+    start = time.perf_counter()
+    result = linkage(data_scaled, "ward")
+    print(f"NN-chain on a memmap: {time.perf_counter() - start:.2f} sec, "
+          f"same heights: {np.allclose(result.Z[:, 2], reference[:, 2])}, "
+          f"same 4 clusters: {(cut(result, 4) == hierarchy.fcluster(reference, 4, 'maxclust')).all()}")
+
+    rng = np.random.default_rng(0)
+    big = np.repeat(data_scaled, 100, axis=0) + rng.normal(scale=0.05, size=(100 * len(data_scaled), 3))
+    start = time.perf_counter()
+    result = linkage(big, "ward", threshold=0.3)
+    n = len(big)
+    print(f"\n{n} rows via BIRCH: {len(result.counts)} subclusters, {time.perf_counter() - start:.2f} sec "
+          f"(full distance matrix would be {n * (n - 1) // 2 * 8 / 1e9:.0f} GB)")
+    print("Cluster sizes (k=4):", np.bincount(cut(result, 4))[1:])